@@ -4,19 +4,85 @@ Can be used with FastAPI, Flask, or as standalone functions
 """
 import json
 import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
+from property_fields import parse_percent, parse_money, tokenize, location_text
+from property_store import PropertyStore
+from change_log import ChangeLog
+
+
+BLOB_DIR_NAME = 'blobs'
+
+
+def build_columns(properties: List[Dict]) -> Dict[str, np.ndarray]:
+    """Normalize numeric fields into typed column arrays, once per snapshot
+    
+    Missing return/price values count as 0 and unparseable ones as NaN, so
+    NaN rows are never excluded by a numeric filter.
+    """
+    return {
+        'annual_return': np.array([parse_percent(p.get('projected_annual_return', '0%')) for p in properties], dtype=float),
+        'price': np.array([parse_money(p.get('estimated_price', '$0')) for p in properties], dtype=float)
+    }
+
+
+def build_text_index(texts: List[str]) -> Dict:
+    """Build a token -> row-set inverted index with a sorted vocabulary for prefix lookups"""
+    postings = {}
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            postings.setdefault(token, set()).add(row)
+    
+    return {'postings': postings, 'vocabulary': sorted(postings)}
+
+
+def search_text_index(index: Dict, query: str) -> set:
+    """Rows whose tokens prefix-match every token of the query ("austin tx", "381", "single fam")"""
+    rows = None
+    vocabulary = index['vocabulary']
+    
+    for query_token in tokenize(query):
+        matches = set()
+        i = bisect_left(vocabulary, query_token)
+        while i < len(vocabulary) and vocabulary[i].startswith(query_token):
+            matches |= index['postings'][vocabulary[i]]
+            i += 1
+        
+        rows = matches if rows is None else rows & matches
+        if not rows:
+            return set()
+    
+    return rows or set()
+
+
+def location_facet(prop: Dict) -> Optional[str]:
+    """City/state bucket used for facet counts"""
+    value = prop.get('city_state') or prop.get('location')
+    return value.strip() if isinstance(value, str) and value.strip() else None
 
 
 class PropertyDataAPI:
     """API for accessing scraped property data"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", db_path: Optional[str] = None):
         self.data_dir = Path(data_dir)
+        db_path = db_path or os.getenv('PROPERTY_DB')
+        self.store = PropertyStore(db_path) if db_path else None
+        self._snapshots = {}
+        self._platforms = None
+        self._platforms_mtime = None
+        self._lock = threading.Lock()
     
     def get_all_properties(self, platform: Optional[str] = None) -> List[Dict]:
         """Get all properties, optionally filtered by platform"""
+        if self.store:
+            return self.store.get_properties(platform)
+        
         all_properties = []
         
         platforms = [platform] if platform else self._get_platforms()
@@ -29,20 +95,28 @@ class PropertyDataAPI:
     
     def get_property_by_id(self, property_id: str) -> Optional[Dict]:
         """Get a specific property by ID"""
-        all_properties = self.get_all_properties()
+        if self.store:
+            return self.store.get_property(property_id)
         
-        for prop in all_properties:
-            if prop.get('property_id') == property_id:
-                return prop
+        for platform in self._get_platforms():
+            snapshot = self._get_snapshot(platform)
+            if snapshot and property_id in snapshot['by_id']:
+                return snapshot['by_id'][property_id]
         
         return None
     
     def get_platforms(self) -> List[str]:
         """Get list of all available platforms"""
+        if self.store:
+            return self.store.get_platforms()
+        
         return self._get_platforms()
     
     def get_platform_stats(self) -> Dict:
         """Get statistics for each platform"""
+        if self.store:
+            return self.store.get_platform_stats()
+        
         stats = {}
         
         for platform in self._get_platforms():
@@ -58,108 +132,255 @@ class PropertyDataAPI:
                          min_return: Optional[float] = None,
                          max_price: Optional[float] = None,
                          property_type: Optional[str] = None,
-                         location: Optional[str] = None) -> List[Dict]:
-        """Search properties with filters"""
-        properties = self.get_all_properties()
+                         location: Optional[str] = None,
+                         with_facets: bool = False):
+        """Search properties with filters
+        
+        location and property_type match by token prefix, so "austin tx",
+        "381" (ZIP prefix) and "single fam" all work. With with_facets=True a
+        dict of results plus per-city and per-type counts is returned instead.
+        """
+        if self.store:
+            filtered = self.store.search(min_return, max_price, property_type, location)
+            return self._with_facets(filtered) if with_facets else filtered
+        
         filtered = []
         
-        for prop in properties:
+        for platform in self._get_platforms():
+            snapshot = self._get_snapshot(platform)
+            if not snapshot or not snapshot['properties']:
+                continue
+            
+            columns = snapshot['columns']
+            mask = np.ones(len(snapshot['properties']), dtype=bool)
+            
             if min_return:
-                return_str = prop.get('projected_annual_return', '0%')
-                try:
-                    return_val = float(return_str.replace('%', ''))
-                    if return_val < min_return:
-                        continue
-                except:
-                    pass
+                mask &= ~(columns['annual_return'] < min_return)
             
             if max_price:
-                price_str = prop.get('estimated_price', '$0')
-                try:
-                    price_val = float(price_str.replace('$', '').replace(',', ''))
-                    if price_val > max_price:
-                        continue
-                except:
-                    pass
+                mask &= ~(columns['price'] > max_price)
             
-            if property_type:
-                if property_type.lower() not in prop.get('property_type', '').lower():
-                    continue
+            for query, index_name in ((property_type, 'type_index'), (location, 'location_index')):
+                if query:
+                    rows = search_text_index(snapshot[index_name], query)
+                    text_mask = np.zeros(len(mask), dtype=bool)
+                    text_mask[list(rows)] = True
+                    mask &= text_mask
             
-            if location:
-                loc_fields = [
-                    prop.get('city_state', ''),
-                    prop.get('location', ''),
-                    prop.get('address', '')
-                ]
-                if not any(location.lower() in field.lower() for field in loc_fields):
-                    continue
+            properties = snapshot['properties']
+            filtered.extend(properties[i] for i in np.flatnonzero(mask))
+        
+        if not with_facets:
+            return filtered
+        
+        return self._with_facets(filtered)
+    
+    def _with_facets(self, filtered: List[Dict]) -> Dict:
+        """Wrap search results with per-city and per-type counts"""
+        return {
+            'results': filtered,
+            'facets': {
+                'location': dict(Counter(filter(None, (location_facet(p) for p in filtered))).most_common()),
+                'property_type': dict(Counter(
+                    p['property_type'].strip() for p in filtered
+                    if isinstance(p.get('property_type'), str) and p['property_type'].strip()
+                ).most_common())
+            }
+        }
+    
+    def load_columns(self, columns: List[str], platform: Optional[str] = None, all_snapshots: bool = False):
+        """Load only the given columns from Parquet snapshots into a DataFrame
+        
+        Reads the latest properties_*.parquet per platform, or every snapshot
+        with all_snapshots=True (adding a `snapshot` timestamp column) for
+        analytics across runs. Requires SCRAPER_SNAPSHOT_FORMATS to include parquet.
+        """
+        import pandas as pd
+        
+        frames = []
+        platforms = [platform] if platform else self._get_platforms()
+        
+        for plat in platforms:
+            parquet_files = sorted((self.data_dir / plat).glob('properties_*.parquet'))
+            if not parquet_files:
+                continue
+            if not all_snapshots:
+                parquet_files = [max(parquet_files, key=lambda f: f.stat().st_mtime)]
             
-            filtered.append(prop)
+            for parquet_file in parquet_files:
+                df = self._read_parquet_columns(parquet_file, columns)
+                df['platform_dir'] = plat
+                if all_snapshots:
+                    df['snapshot'] = pd.to_datetime(parquet_file.stem.replace('properties_', ''), format='%Y%m%d_%H%M%S')
+                frames.append(df)
+        
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        
+        return pd.concat(frames, ignore_index=True)
+    
+    @staticmethod
+    def _read_parquet_columns(parquet_file: Path, columns: List[str]):
+        """Read the requested columns, filling ones an older snapshot lacks with None"""
+        import pandas as pd
+        import pyarrow.parquet as pq
+        
+        available = set(pq.read_schema(parquet_file).names)
+        df = pd.read_parquet(parquet_file, columns=[c for c in columns if c in available])
+        for column in columns:
+            if column not in df:
+                df[column] = None
+        
+        return df[columns]
+    
+    def get_changes(self,
+                    since: Optional[str] = None,
+                    until: Optional[str] = None,
+                    platform: Optional[str] = None,
+                    event: Optional[str] = None) -> List[Dict]:
+        """Get added/removed/changed events from the change log within [since, until)
+        
+        Dates are ISO strings ('2025-10-01' or '2025-10-01T12:00:00').
+        """
+        events = []
+        platforms = [platform] if platform else self._get_platforms()
+        
+        for plat in platforms:
+            events.extend(self._change_log(plat).read(since=since, until=until, event=event))
         
-        return filtered
+        events.sort(key=lambda e: e.get('timestamp', ''))
+        return events
+    
+    def get_property_history(self, property_id: str, platform: Optional[str] = None) -> List[Dict]:
+        """Get the timeline of events for one listing"""
+        return [e for e in self.get_changes(platform=platform) if e.get('property_id') == property_id]
     
     def get_new_properties(self, since_date: Optional[str] = None) -> List[Dict]:
         """Get properties added since a specific date"""
-        all_properties = self.get_all_properties()
-        
         if not since_date:
             from datetime import timedelta
             since_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
         
         new_properties = []
-        for prop in all_properties:
-            scraped_at = prop.get('scraped_at', '')
-            if scraped_at >= since_date:
-                new_properties.append(prop)
+        for platform in self._get_platforms():
+            change_log = self._change_log(platform)
+            
+            if os.path.exists(change_log.path):
+                added_ids = {e['property_id'] for e in change_log.read(since=since_date, event='added')}
+                new_properties.extend(
+                    prop for prop in self.get_all_properties(platform)
+                    if (prop.get('property_id') or prop.get('url')) in added_ids
+                )
+            else:
+                # Platforms scraped before the change log existed
+                new_properties.extend(
+                    prop for prop in self.get_all_properties(platform)
+                    if prop.get('scraped_at', '') >= since_date
+                )
         
         return new_properties
     
+    def _change_log(self, platform: str) -> ChangeLog:
+        return ChangeLog(str(self.data_dir / platform / 'changes.jsonl'))
+    
     def _get_platforms(self) -> List[str]:
         """Get list of platform directories"""
-        if not self.data_dir.exists():
+        try:
+            data_mtime = self.data_dir.stat().st_mtime
+        except FileNotFoundError:
             return []
         
-        return [d.name for d in self.data_dir.iterdir() if d.is_dir()]
+        if self._platforms is None or self._platforms_mtime != data_mtime:
+            self._platforms = [d.name for d in self.data_dir.iterdir() if d.is_dir() and d.name != BLOB_DIR_NAME]
+            self._platforms_mtime = data_mtime
+        
+        return list(self._platforms)
     
-    def _load_latest_properties(self, platform: str) -> List[Dict]:
-        """Load the most recent properties file for a platform"""
+    def _get_snapshot(self, platform: str) -> Optional[Dict]:
+        """Get the cached latest snapshot for a platform, reloading only when it changes
+        
+        A new properties_*.json file changes the directory mtime and a rewrite
+        changes the file mtime, so two stat calls decide whether to reparse.
+        """
         platform_dir = self.data_dir / platform
         
-        if not platform_dir.exists():
-            return []
+        try:
+            dir_mtime = platform_dir.stat().st_mtime
+        except FileNotFoundError:
+            self._snapshots.pop(platform, None)
+            return None
+        
+        cached = self._snapshots.get(platform)
+        if cached and cached['dir_mtime'] == dir_mtime:
+            try:
+                if cached['file'] is None or cached['file'].stat().st_mtime == cached['mtime']:
+                    return cached
+            except FileNotFoundError:
+                pass
+        
+        with self._lock:
+            snapshot = self._load_snapshot(platform_dir, dir_mtime)
+            self._snapshots[platform] = snapshot
+        
+        return snapshot
+    
+    def _load_snapshot(self, platform_dir: Path, dir_mtime: float) -> Dict:
+        """Parse a platform's most recent properties file and index it by property_id"""
+        snapshot = {
+            'dir_mtime': dir_mtime,
+            'file': None,
+            'mtime': None,
+            'properties': [],
+            'by_id': {},
+            'columns': build_columns([]),
+            'location_index': build_text_index([]),
+            'type_index': build_text_index([])
+        }
         
         json_files = list(platform_dir.glob('properties_*.json'))
         
         if not json_files:
-            return []
+            return snapshot
         
         latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
+        snapshot['file'] = latest_file
+        snapshot['mtime'] = latest_file.stat().st_mtime
         
         try:
             with open(latest_file, 'r') as f:
-                return json.load(f)
+                snapshot['properties'] = json.load(f)
         except:
+            return snapshot
+        
+        snapshot['by_id'] = {
+            prop['property_id']: prop for prop in snapshot['properties'] if prop.get('property_id')
+        }
+        snapshot['columns'] = build_columns(snapshot['properties'])
+        snapshot['location_index'] = build_text_index([location_text(p) for p in snapshot['properties']])
+        snapshot['type_index'] = build_text_index([p.get('property_type') for p in snapshot['properties']])
+        
+        return snapshot
+    
+    def _load_latest_properties(self, platform: str) -> List[Dict]:
+        """Load the most recent properties file for a platform"""
+        snapshot = self._get_snapshot(platform)
+        
+        if not snapshot:
             return []
+        
+        return list(snapshot['properties'])
     
     def _get_last_update_time(self, platform: str) -> str:
         """Get last update timestamp for a platform"""
-        platform_dir = self.data_dir / platform
+        snapshot = self._get_snapshot(platform)
         
-        if not platform_dir.exists():
+        if not snapshot or snapshot['file'] is None:
             return "Never"
         
-        json_files = list(platform_dir.glob('properties_*.json'))
-        
-        if not json_files:
-            return "Never"
-        
-        latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
-        timestamp = datetime.fromtimestamp(latest_file.stat().st_mtime)
+        timestamp = datetime.fromtimestamp(snapshot['mtime'])
         
         return timestamp.strftime('%Y-%m-%d %H:%M:%S')
 
-
 """
 from fastapi import FastAPI, Query
 from typing import Optional
@@ -179,6 +400,15 @@ def get_property(property_id: str):
 def get_platforms():
     return api.get_platforms()
 
+@app.get("/changes")
+def get_changes(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    platform: Optional[str] = None,
+    event: Optional[str] = None
+):
+    return api.get_changes(since=since, until=until, platform=platform, event=event)
+
 @app.get("/stats")
 def get_stats():
     return api.get_platform_stats()
@@ -188,13 +418,15 @@ def search_properties(
     min_return: Optional[float] = None,
     max_price: Optional[float] = None,
     property_type: Optional[str] = None,
-    location: Optional[str] = None
+    location: Optional[str] = None,
+    facets: bool = False
 ):
     return api.search_properties(
         min_return=min_return,
         max_price=max_price,
         property_type=property_type,
-        location=location
+        location=location,
+        with_facets=facets
     )
 """
 
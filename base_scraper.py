@@ -3,37 +3,196 @@ Base scraper class for RWA tokenized real estate platforms
 """
 import os
 import json
+import textwrap
 import time
+import glob
+import hashlib
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from queue import Queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
 from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+from browser_session import chromedriver_path, forget_chromedriver_path, driver_alive
+from static_page import StaticDriver
+from field_spec import EXTRACT_SCRIPT, evaluate_spec
+from document_downloader import DocumentDownloader
+from rate_limiter import HostRateLimiter
+from retry_policy import RetryPolicy, BlockedPageError
+from run_metrics import RunMetrics
+from blob_store import BlobStore
+from property_store import PropertyStore
+from property_fields import parse_percent, parse_money
+from change_log import ChangeLog, events_from_diff
+from record_diff import diff_snapshots
+from snapshot_writer import SnapshotWriter
+from run_checkpoint import RunCheckpoint
+
+
+# Field changes worth calling out in the run log
+ALERT_FIELDS = ('estimated_price', 'projected_annual_return', 'rental_yield')
+
+# Requests no scraper needs: the DOM keeps img[src] even when the image bytes
+# are never fetched
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*",
+    "*segment.com*", "*intercom.io*", "*intercomcdn.com*", "*mixpanel.com*",
+    "*fullstory.com*", "*clarity.ms*", "*hubspot.com*", "*hs-scripts.com*",
+    "*youtube.com/embed*", "*vimeo.com*"
+]
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 
 class BaseScraper(ABC):
     """Base class for all platform scrapers"""
     
-    def __init__(self, platform_name: str, base_url: str, use_proxy: bool = False):
+    # Selectors that signal a page has rendered - override per platform with
+    # a structural element every listing page has, never an optional figure.
+    # Selectors starting with "/" are XPath.
+    listing_selector = "a[href]"
+    detail_ready_selector = "h1"
+    page_load_timeout = 10
+    
+    # Optional element holding the figures a platform reads, awaited for up
+    # to detail_data_timeout seconds once a detail page has rendered. Pages
+    # without it are still scraped, with those figures left out
+    detail_data_selector = None
+    detail_data_timeout = 3
+    
+    # Declarative detail-page fields (see field_spec.py) read by
+    # scrape_with_field_spec(); platform_label is the record's 'platform'
+    # value and defaults to platform_name
+    field_spec: Dict[str, Dict] = {}
+    platform_label = None
+    
+    # Fetch detail pages over plain HTTP first, falling back to Selenium
+    # when any of the required fields are missing from the raw HTML. Static
+    # scrapers require the figures they exist for: a JS app's empty shell
+    # still has a title and body text
+    static_mode = False
+    static_required_fields = ('title', 'full_description')
+    
+    # Consecutive incomplete static fetches after which a host goes
+    # straight to the browser for the rest of the run
+    static_misses_allowed = 3
+    
+    # Max seconds scroll_listings() spends loading the marketplace
+    discovery_budget = 120
+    
+    # Every Nth incremental run in a row that stopped discovery early
+    # scrolls the whole marketplace instead, so carried-forward listings are
+    # re-checked and delistings below the first screen get noticed
+    full_discovery_every = 12
+    
+    # Scrapers that talk to a JSON API directly can skip Chrome entirely
+    requires_browser = True
+    
+    # Chrome resource blocking: "off", "assets" (images, fonts, media and
+    # trackers) or "strict" (assets, and only allowed_hosts resolve). None
+    # means SCRAPER_RESOURCE_BLOCKING, else "assets"
+    resource_blocking = None
+    
+    # Page titles that mean the site served a block or bot challenge
+    blocked_page_markers = ('access denied', 'attention required', 'just a moment', 'forbidden')
+    
+    def __init__(self, platform_name: str, base_url: str, use_proxy: bool = False, allowed_hosts: Optional[List[str]] = None):
         self.platform_name = platform_name
         self.base_url = base_url
+        self.allowed_hosts = list(allowed_hosts or [urlparse(base_url).hostname])
         self.use_proxy = use_proxy
-        self.driver = None
-        self.properties = []
+        self.resource_blocking = self.resource_blocking or os.getenv('SCRAPER_RESOURCE_BLOCKING', 'assets')
+        self.discovery_budget = float(os.getenv('SCRAPER_DISCOVERY_BUDGET', self.discovery_budget))
+        self.full_discovery_every = int(os.getenv('SCRAPER_FULL_DISCOVERY_EVERY', self.full_discovery_every))
+        self._driver = None
+        self._thread_local = threading.local()
+        self.browser_session = None
+        self.snapshot = None
+        self.incremental = False
+        self.discovery_truncated = False
+        self.listing_summaries = {}
+        self.record_hashes = {}
+        self.history = {}
         self.output_dir = f"data/{platform_name}"
-        self.documents_dir = f"data/{platform_name}/documents"
+        self.blob_store = BlobStore("data/blobs")
+        self.change_log = ChangeLog(os.path.join(self.output_dir, 'changes.jsonl'))
+        self.checkpoint = RunCheckpoint(self.output_dir)
+        self.metrics = RunMetrics(platform_name)
         
         os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(self.documents_dir, exist_ok=True)
         
+        # JSON is always written since incremental runs and the API read it
+        formats = os.getenv('SCRAPER_SNAPSHOT_FORMATS', 'json,csv').split(',')
+        self.snapshot_formats = ['json'] + [f.strip() for f in formats if f.strip() and f.strip() != 'json']
+        
+        self.detail_workers = int(os.getenv('SCRAPER_DETAIL_WORKERS', '1'))
+        self.max_per_host = int(os.getenv('SCRAPER_MAX_PER_HOST', '2'))
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        self._static_misses = {}
+        
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.getenv('SCRAPER_MAX_ATTEMPTS', '3')),
+            base_delay=float(os.getenv('SCRAPER_RETRY_BASE_DELAY', '2'))
+        )
+        
+        # Shared by page loads and document downloads; adapts per host
+        self.rate_limiter = HostRateLimiter(
+            rate=float(os.getenv('SCRAPER_RATE_PER_HOST', '0.5')),
+            max_rate=float(os.getenv('SCRAPER_MAX_RATE_PER_HOST', '4'))
+        )
+        
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        download_workers = int(os.getenv('SCRAPER_DOWNLOAD_WORKERS', '4'))
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(10, self.detail_workers * 2 + download_workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.downloader = DocumentDownloader(
+            self.session,
+            self.blob_store,
+            platform_name,
+            max_workers=download_workers,
+            max_per_host=self.max_per_host,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            metrics=self.metrics
+        )
+        
+    @property
+    def driver(self):
+        """WebDriver for the current thread (a pool driver inside detail workers)"""
+        return getattr(self._thread_local, 'driver', None) or self._driver
+    
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+    
     def setup_driver(self, headless: bool = True):
-        """Setup Selenium WebDriver with Chrome"""
+        """Setup Selenium WebDriver with Chrome, reusing the warm browser session if one was given"""
+        if self.browser_session is not None:
+            self.driver = self.browser_session.acquire(lambda: self._create_driver(headless=headless))
+        else:
+            self.driver = self._create_driver(headless=headless)
+    
+    def _create_driver(self, headless: bool = True):
+        """Create a new Chrome WebDriver instance"""
         chrome_options = Options()
         
         if headless:
@@ -43,7 +202,22 @@ class BaseScraper(ABC):
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+        
+        if self.resource_blocking != "off":
+            # Hand over the DOM once it is parsed instead of after every subresource
+            chrome_options.page_load_strategy = "eager"
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2
+            })
+        
+        if self.resource_blocking == "strict":
+            # Every other host fails DNS resolution inside Chrome
+            rules = ["MAP * ~NOTFOUND"]
+            for host in self.allowed_hosts:
+                rules.extend([f"EXCLUDE {host}", f"EXCLUDE *.{host}"])
+            chrome_options.add_argument(f"--host-resolver-rules={', '.join(rules)}")
         
         if self.use_proxy:
             proxy_url = os.getenv('PROXY_URL')
@@ -51,35 +225,401 @@ class BaseScraper(ABC):
                 chrome_options.add_argument(f'--proxy-server={proxy_url}')
         
         try:
-            # Try using ChromeDriverManager
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Try the cached ChromeDriverManager install
+            service = Service(chromedriver_path())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         except:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            forget_chromedriver_path()
+            driver = webdriver.Chrome(options=chrome_options)
         
-        self.driver.implicitly_wait(10)
+        # Waiting is explicit (load_page, wait_for_selector); an implicit wait
+        # would make every optional find_element that misses block for it
+        driver.implicitly_wait(0)
+        
+        if self.resource_blocking != "off":
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                print(f"Could not enable resource blocking: {str(e)}")
+        
+        return driver
         
     def close_driver(self):
-        """Close the WebDriver"""
+        """Close the WebDriver, or hand it back to the browser session to stay warm"""
         if self.driver:
-            self.driver.quit()
+            if self.browser_session is not None:
+                self.browser_session.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
     
-    def download_file(self, url: str, filename: str) -> Optional[str]:
-        """Download a file (PDF, image, etc.) from a URL"""
+    def recover_driver(self) -> bool:
+        """Restart the main WebDriver if it has died; returns True when it was restarted"""
+        if not self.requires_browser or self._driver is None or driver_alive(self._driver):
+            return False
+        
+        print("WebDriver stopped responding, restarting Chrome")
+        if self.browser_session is not None:
+            self.driver = self.browser_session.restart(self._create_driver)
+        else:
+            try:
+                self._driver.quit()
+            except:
+                pass
+            self.driver = self._create_driver()
+        return True
+    
+    def wait_for(self, condition, timeout: Optional[float] = None) -> bool:
+        """Wait until a WebDriverWait condition holds; returns False on timeout"""
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            WebDriverWait(self.driver, timeout or self.page_load_timeout, poll_frequency=0.2).until(condition)
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_selector(self, selector: str, timeout: Optional[float] = None) -> bool:
+        """Wait until an element matching the CSS (or, starting with "/", XPath) selector is present"""
+        by = By.XPATH if selector.startswith('/') else By.CSS_SELECTOR
+        return self.wait_for(EC.presence_of_element_located((by, selector)), timeout)
+    
+    def load_page(self, url: str, ready_selector: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Navigate to a URL and return as soon as its ready selector appears
+        
+        Waits for the host's rate limiter first; a page that fails to render
+        in time slows the host down. Raises BlockedPageError when the page
+        that did load is a block or bot-challenge page.
+        
+        Detail pages (no ready_selector given, so detail_ready_selector is
+        awaited) raise TimeoutException when they don't render, letting the
+        retry policy re-queue them - except on their last attempt, where
+        whatever did render is scraped so the listing stays in the snapshot.
+        Other loads return False and leave it to the caller.
+        """
+        with self.rate_limiter.throttle(url) as outcome, self.metrics.span('load_page'):
+            self.driver.get(url)
+            if isinstance(self.driver, StaticDriver):
+                return True
+            ready = self.wait_for_selector(ready_selector or self.detail_ready_selector, timeout)
+            outcome['slow'] = not ready
+            if not ready:
+                title = self.driver.title or ''
+                if any(marker in title.lower() for marker in self.blocked_page_markers):
+                    raise BlockedPageError(f"Blocked page served for {url}: {title}")
+            elif ready_selector is None and self.detail_data_selector:
+                self.wait_for_selector(self.detail_data_selector, self.detail_data_timeout)
+        
+        if not ready:
+            if ready_selector is None and not getattr(self._thread_local, 'last_attempt', True):
+                raise TimeoutException(f"Timed out waiting for page to render: {url}")
+            print(f"Timed out waiting for page to render: {url}")
+        return ready
+    
+    def extract_fields(self, spec: Dict[str, Dict]) -> Dict[str, Any]:
+        """Extract every field of a declarative spec (see field_spec.py) in one round-trip"""
+        with self.metrics.span('extract_fields'):
+            if isinstance(self.driver, StaticDriver):
+                return evaluate_spec(self.driver, spec)
+            return self.driver.execute_script(EXTRACT_SCRIPT, spec) or {}
+    
+    def scroll_listings(self, timeout: float = 2) -> int:
+        """Scroll the marketplace until every listing anchor has loaded
+        
+        Stops when neither the listing_selector anchor count nor the page
+        height grows after a scroll, when the discovery time budget runs out,
+        or - on incremental runs - as soon as a batch loaded by a scroll holds
+        only listings already in property_history.json (marketplaces list
+        newest first, so the rest is known too). The first screen never
+        stops discovery on its own, and after full_discovery_every - 1
+        truncated runs in a row the known-listing stop is skipped entirely.
+        Stopping early sets discovery_truncated so run() carries the unseen
+        listings forward. Returns the anchor count.
+        """
+        state_script = "return [document.querySelectorAll(arguments[0]).length, document.body.scrollHeight]"
+        batch_script = (
+            "var anchors = document.querySelectorAll(arguments[0]), hrefs = [];"
+            "for (var i = arguments[1]; i < anchors.length; i++) hrefs.push(anchors[i].href);"
+            "return hrefs;"
+        )
+        known_ids = set()
+        if self.incremental:
+            if self.history.get('truncated_runs', 0) + 1 >= self.full_discovery_every:
+                print(f"Full discovery run (every {self.full_discovery_every} incremental runs)")
+            else:
+                known_ids = set(self.history.get('property_ids', []))
+        deadline = time.monotonic() + self.discovery_budget
+        
+        count, height = self.driver.execute_script(state_script, self.listing_selector)
+        # Only batches loaded by a scroll are checked against known listings
+        checked = count
+        
+        def grew(driver):
+            new_count, new_height = driver.execute_script(state_script, self.listing_selector)
+            return new_count > count or new_height > height
+        
+        while True:
+            if known_ids and count > checked:
+                batch = self.driver.execute_script(batch_script, self.listing_selector, checked)
+                checked = count
+                if all(self.property_id_from_url(href or '') in known_ids for href in batch):
+                    print(f"Reached already-known listings after {count} anchors")
+                    self.discovery_truncated = True
+                    break
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"Discovery time budget ({self.discovery_budget}s) used up after {count} anchors")
+                self.discovery_truncated = True
+                break
             
-            filepath = os.path.join(self.documents_dir, filename)
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            if not self.wait_for(grew, min(timeout, remaining)):
+                break
+            count, height = self.driver.execute_script(state_script, self.listing_selector)
+        
+        return count
+    
+    def fetch_property_details(self, property_url: str) -> Dict:
+        """Scrape a property, trying a static HTTP fetch before the browser
+        
+        Documents found by the static attempt are only queued once its
+        result is accepted, so a browser fallback doesn't download them
+        twice. A host whose static fetches keep coming back incomplete is
+        sent straight to the browser.
+        """
+        host = urlparse(property_url).netloc
+        if self.static_mode and self._static_misses.get(host, 0) < self.static_misses_allowed:
+            deferred = []
+            details = self._scrape_static(property_url, deferred)
+            complete = bool(details) and all(details.get(field) for field in self.static_required_fields)
+            
+            with self._host_slots_lock:
+                self._static_misses[host] = 0 if complete else self._static_misses.get(host, 0) + 1
+                if not complete and self._static_misses[host] == self.static_misses_allowed:
+                    print(f"Static fetches keep coming back incomplete for {host}, using the browser only")
             
-            print(f"Downloaded: {filename}")
-            return filepath
+            for args, future in deferred:
+                if complete:
+                    self.downloader.submit(*args).add_done_callback(lambda done, future=future: future.set_result(done.result()))
+                else:
+                    future.cancel()
+            
+            if complete:
+                return details
+            print(f"Static fetch incomplete, falling back to browser: {property_url}")
+        
+        with self.metrics.span('scrape_property_details'):
+            return self.scrape_property_details(property_url)
+    
+    def _scrape_static(self, property_url: str, deferred: List) -> Optional[Dict]:
+        """Run scrape_property_details against the raw HTML of a page
+        
+        download_file calls made meanwhile are collected in deferred as
+        ((url, property_id, doc_type), future) instead of being queued.
+        """
+        previous_driver = getattr(self._thread_local, 'driver', None)
+        self._thread_local.driver = StaticDriver(self.session)
+        self._thread_local.deferred_downloads = deferred
+        try:
+            with self.metrics.span('scrape_property_static'):
+                return self.scrape_property_details(property_url)
         except Exception as e:
-            print(f"Error downloading {url}: {str(e)}")
+            print(f"Static fetch failed for {property_url}: {str(e)}")
             return None
+        finally:
+            self._thread_local.driver = previous_driver
+            self._thread_local.deferred_downloads = None
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore capping concurrent requests to the URL's host"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(max(1, self.max_per_host))
+            return self._host_slots[host]
+    
+    def _scrape_property(self, property_url: str, attempt: int = 1) -> Optional[bool]:
+        """Scrape and emit one property
+        
+        Returns True when it was emitted, False when it failed for good or
+        came back empty, and None when the error is retryable and the
+        caller should re-queue it.
+        """
+        self._thread_local.last_attempt = attempt >= self.retry_policy.max_attempts
+        try:
+            details = self.fetch_property_details(property_url)
+            if details:
+                self.emit_property(property_url, details)
+            return bool(details)
+        except Exception as e:
+            if getattr(self._thread_local, 'driver', None) is None:
+                self.recover_driver()
+            if self.retry_policy.should_retry(e, attempt):
+                print(f"Error scraping {property_url} (attempt {attempt}/{self.retry_policy.max_attempts}), "
+                      f"retrying later: {str(e)}")
+                return None
+            print(f"Error scraping {property_url}: {str(e)}")
+            return False
+    
+    def _scrape_details_parallel(self, property_urls: List[str]) -> int:
+        """Scrape property details with a pool of WebDrivers, capped per host"""
+        drivers = Queue()
+        drivers.put(self._driver)
+        extra_drivers = []
+        
+        for _ in range(self.detail_workers - 1):
+            if not self.requires_browser:
+                drivers.put(None)
+                continue
+            try:
+                driver = self._create_driver(headless=True)
+                extra_drivers.append(driver)
+                drivers.put(driver)
+            except Exception as e:
+                print(f"Could not start extra WebDriver: {str(e)}")
+                break
+        
+        pool_size = drivers.qsize()
+        print(f"Using {pool_size} workers (max {self.max_per_host} per host)")
+        
+        def healthy(driver):
+            """Replace a crashed pool driver before it goes back in the queue"""
+            if driver is None or driver_alive(driver):
+                return driver
+            if driver is self._driver:
+                self.recover_driver()
+                return self._driver
+            
+            print("Pool WebDriver stopped responding, restarting Chrome")
+            try:
+                driver.quit()
+            except:
+                pass
+            try:
+                replacement = self._create_driver(headless=True)
+            except Exception as e:
+                print(f"Could not restart pool WebDriver: {str(e)}")
+                return driver
+            extra_drivers[extra_drivers.index(driver)] = replacement
+            return replacement
+        
+        def scrape(index, prop_url, attempt, not_before):
+            time.sleep(max(0, not_before - time.monotonic()))
+            driver = drivers.get()
+            self._thread_local.driver = driver
+            try:
+                print(f"[{index}/{len(property_urls)}] Scraping {prop_url}")
+                with self._host_slot(prop_url):
+                    return self._scrape_property(prop_url, attempt)
+            finally:
+                self._thread_local.driver = None
+                drivers.put(healthy(driver))
+        
+        scraped = 0
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                pending = {
+                    executor.submit(scrape, index, prop_url, 1, 0): (index, prop_url, 1)
+                    for index, prop_url in enumerate(property_urls, 1)
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, prop_url, attempt = pending.pop(future)
+                        result = future.result()
+                        if result is None:
+                            # Back of the executor queue, behind the rest of the run
+                            not_before = time.monotonic() + self.retry_policy.delay(attempt)
+                            pending[executor.submit(scrape, index, prop_url, attempt + 1, not_before)] = (index, prop_url, attempt + 1)
+                        elif result:
+                            scraped += 1
+        finally:
+            for driver in extra_drivers:
+                try:
+                    driver.quit()
+                except:
+                    pass
+        
+        return scraped
+    
+    def download_file(self, url: str, property_id: str, doc_type: str = 'document') -> Future:
+        """Queue a file (PDF, image, etc.) for download into the shared blob store
+        
+        Returns a future resolving to the file's sha256 (None once it has
+        failed for good); retryable failures are re-queued behind the other
+        downloads. Call self.downloader.wait() to block until queued
+        downloads finish.
+        """
+        deferred = getattr(self._thread_local, 'deferred_downloads', None)
+        if deferred is not None:
+            future = Future()
+            deferred.append(((url, property_id, doc_type), future))
+            return future
+        return self.downloader.submit(url, property_id, doc_type)
+    
+    @staticmethod
+    def document_urls(prop: Dict) -> List[str]:
+        """Document URLs of a property, whether stored as a list or grouped by type"""
+        documents = prop.get('documents') or []
+        if isinstance(documents, dict):
+            return [doc['url'] for docs in documents.values() for doc in docs if doc.get('url')]
+        return [doc for doc in documents if isinstance(doc, str)]
+    
+    def attach_document_blobs(self, prop: Dict) -> Dict:
+        """Reference a property's downloaded documents by blob hash"""
+        blobs = {}
+        for url in self.document_urls(prop):
+            digest = self.downloader.blob_hash(url)
+            if digest:
+                blobs[url] = digest
+        if blobs:
+            prop['document_blobs'] = blobs
+        return prop
+    
+    def iter_properties(self) -> Iterator[Dict]:
+        """Stream this run's properties back from the snapshot file"""
+        if self.snapshot is None:
+            return
+        for prop in self.snapshot:
+            yield self.attach_document_blobs(prop)
+    
+    def emit_property(self, property_url: str, details: Dict):
+        """Stream a finished property into the snapshot and checkpoint it"""
+        self.snapshot.write(details)
+        self.checkpoint.mark_done(property_url)
+    
+    def resume_marketplace(self):
+        """Restore marketplace-side state when resuming from a checkpoint
+        
+        The listing URLs and card summaries come from the checkpoint; override
+        this for anything else scrape_marketplace() sets up (login, API data).
+        """
+        pass
+    
+    def _resume_run(self) -> Optional[List[str]]:
+        """Reopen an interrupted run, returning the URLs still to scrape"""
+        checkpoint = self.checkpoint.load()
+        if not checkpoint or not os.path.exists(f"{checkpoint['snapshot']}.part"):
+            print("No interrupted run to resume, starting fresh")
+            return None
+        
+        self.snapshot = SnapshotWriter.resume(checkpoint['snapshot'])
+        self.listing_summaries = checkpoint['listing_summaries']
+        self.discovery_truncated = checkpoint.get('discovery_truncated', False)
+        
+        # A record can reach the snapshot just before a crash stops its checkpoint line
+        done = checkpoint['done'] | {prop.get('url') for prop in self.snapshot}
+        property_urls = checkpoint['property_urls']
+        remaining = [url for url in property_urls if url not in done]
+        
+        print(f"Resuming run from {checkpoint['started_at']}: "
+              f"{len(property_urls) - len(remaining)}/{len(property_urls)} properties already done")
+        self.resume_marketplace()
+        return remaining
+    
+    @property
+    def property_count(self) -> int:
+        return self.snapshot.count if self.snapshot else 0
     
     def save_properties(self, format: str = 'json'):
         """Save scraped properties to file"""
@@ -88,37 +628,108 @@ class BaseScraper(ABC):
         if format == 'json':
             filepath = os.path.join(self.output_dir, f"properties_{timestamp}.json")
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.properties, f, indent=2, ensure_ascii=False)
+                # Same layout as json.dump(..., indent=2), one record at a time
+                f.write('[')
+                for i, prop in enumerate(self.iter_properties()):
+                    f.write(',\n' if i else '\n')
+                    f.write(textwrap.indent(json.dumps(prop, indent=2, ensure_ascii=False), '  '))
+                f.write('\n]' if self.property_count else ']')
         elif format == 'csv':
             import pandas as pd
             filepath = os.path.join(self.output_dir, f"properties_{timestamp}.csv")
-            df = pd.DataFrame(self.properties)
+            df = pd.DataFrame(list(self.iter_properties()))
             df.to_csv(filepath, index=False, encoding='utf-8')
+        elif format == 'parquet':
+            import pandas as pd
+            filepath = os.path.join(self.output_dir, f"properties_{timestamp}.parquet")
+            df = pd.DataFrame(list(self.iter_properties()))
+            # Nested values (documents, images, blob maps) are stored as JSON text
+            for column in df.columns:
+                if df[column].map(lambda value: isinstance(value, (dict, list))).any():
+                    df[column] = df[column].map(
+                        lambda value: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                    )
+            if 'estimated_price' in df:
+                df['estimated_price_value'] = df['estimated_price'].map(parse_money)
+            if 'projected_annual_return' in df:
+                df['projected_annual_return_value'] = df['projected_annual_return'].map(parse_percent)
+            df.to_parquet(filepath, index=False, compression='zstd')
+        elif format == 'sqlite':
+            filepath = os.getenv('PROPERTY_DB', 'data/properties.db')
+            stats = PropertyStore(filepath).save_snapshot(self.platform_name, self.iter_properties())
+            print(f"SQLite: {stats['inserted']} new, {stats['updated']} changed, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
         
-        print(f"Saved {len(self.properties)} properties to {filepath}")
+        print(f"Saved {self.property_count} properties to {filepath}")
         return filepath
     
-    def load_previous_properties(self) -> set:
-        """Load previously scraped property IDs to detect new listings"""
+    def load_history(self) -> Dict:
+        """Load the previous scrape's history file
+        
+        Holds its property IDs, marketplace card hashes, normalized record
+        hashes and how many runs in a row ended discovery early. run() reads
+        it once into self.history.
+        """
         history_file = os.path.join(self.output_dir, 'property_history.json')
         
         if os.path.exists(history_file):
             with open(history_file, 'r') as f:
-                history = json.load(f)
-                return set(history.get('property_ids', []))
+                return json.load(f)
+        
+        return {}
+    
+    def load_previous_snapshot(self) -> Dict[str, Dict]:
+        """Load the most recent saved properties, keyed by property ID"""
+        json_files = glob.glob(os.path.join(self.output_dir, 'properties_*.json'))
+        
+        if not json_files:
+            return {}
+        
+        latest_file = max(json_files, key=os.path.getmtime)
+        
+        try:
+            with open(latest_file, 'r', encoding='utf-8') as f:
+                properties = json.load(f)
+        except Exception as e:
+            print(f"Could not load previous snapshot {latest_file}: {str(e)}")
+            return {}
         
-        return set()
+        return {prop.get('property_id') or prop.get('url'): prop for prop in properties}
+    
+    @staticmethod
+    def property_id_from_url(url: str) -> str:
+        """Property ID convention shared by all scrapers"""
+        return url.split('/')[-1]
+    
+    @staticmethod
+    def _summary_hash(summary: str) -> str:
+        return hashlib.sha1(summary.encode('utf-8')).hexdigest()
     
     def update_property_history(self):
         """Update the history file with current property IDs"""
         history_file = os.path.join(self.output_dir, 'property_history.json')
         
-        current_ids = [prop.get('property_id') or prop.get('url') for prop in self.properties]
+        current_ids = [prop.get('property_id') or prop.get('url') for prop in self.iter_properties()]
+        
+        summaries = {
+            self.property_id_from_url(url): self._summary_hash(summary)
+            for url, summary in self.listing_summaries.items()
+            if summary is not None
+        }
+        truncated_runs = 0
+        if self.discovery_truncated:
+            # Listings past the point discovery stopped keep their card hashes
+            for prop_id, digest in self.history.get('summaries', {}).items():
+                summaries.setdefault(prop_id, digest)
+            truncated_runs = self.history.get('truncated_runs', 0) + 1
         
         history = {
             'last_updated': datetime.now().isoformat(),
             'property_ids': current_ids,
-            'total_count': len(current_ids)
+            'total_count': len(current_ids),
+            'summaries': summaries,
+            'record_hashes': self.record_hashes,
+            'truncated_runs': truncated_runs
         }
         
         with open(history_file, 'w') as f:
@@ -126,16 +737,40 @@ class BaseScraper(ABC):
     
     def detect_new_properties(self) -> List[Dict]:
         """Detect new properties compared to previous scrape"""
-        previous_ids = self.load_previous_properties()
+        previous_ids = set(self.history.get('property_ids', []))
         
         new_properties = []
-        for prop in self.properties:
+        for prop in self.iter_properties():
             prop_id = prop.get('property_id') or prop.get('url')
             if prop_id not in previous_ids:
                 new_properties.append(prop)
         
         return new_properties
     
+    def record_changes(self, previous_snapshot: Dict[str, Dict]) -> Dict:
+        """Diff against the previous snapshot and append the events to the change log"""
+        titles = {}
+        
+        def stream():
+            for prop in self.iter_properties():
+                titles[prop.get('property_id') or prop.get('url')] = prop.get('title')
+                yield prop
+        
+        diff = diff_snapshots(previous_snapshot, stream(), self.history.get('record_hashes', {}))
+        self.record_hashes = diff['hashes']
+        
+        events = events_from_diff(self.platform_name, diff, previous_snapshot, titles)
+        self.change_log.append(events)
+        
+        print(f"Changes: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+              f"{diff['unchanged']} unchanged, {len(diff['removed'])} removed")
+        for prop_id, changes in diff['changed'].items():
+            for field in ALERT_FIELDS:
+                if field in changes:
+                    print(f"  - {prop_id} {field}: {changes[field]['old']} -> {changes[field]['new']}")
+        
+        return diff
+    
     @abstractmethod
     def scrape_marketplace(self) -> List[Dict]:
         """Scrape the marketplace listings - must be implemented by each platform"""
@@ -146,35 +781,156 @@ class BaseScraper(ABC):
         """Scrape detailed information for a single property - must be implemented by each platform"""
         pass
     
-    def run(self, full_scrape: bool = True):
-        """Main execution method"""
+    def scrape_with_field_spec(self, property_url: str) -> Dict:
+        """scrape_property_details() for platforms described by a field_spec
+        
+        Extracts every field in one in-page pass instead of a WebDriver
+        round-trip per element, and downloads the 'documents' it finds.
+        """
+        self.load_page(property_url)
+        
+        property_data = {
+            'platform': self.platform_label or self.platform_name,
+            'url': property_url,
+            'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'property_id': self.property_id_from_url(property_url)
+        }
+        
+        try:
+            property_data.update(self.extract_fields(self.field_spec))
+            
+            for href in property_data.get('documents', []):
+                try:
+                    self.download_file(href, property_data['property_id'])
+                except:
+                    pass
+            
+        except Exception as e:
+            print(f"Error scraping property details: {str(e)}")
+        
+        return property_data
+    
+    def _scrape_details(self, property_urls: List[str]) -> int:
+        """Scrape detail pages into the snapshot stream, through the driver pool when configured"""
+        if self.detail_workers > 1:
+            return self._scrape_details_parallel(property_urls)
+        
+        # Retryable failures go to the back of the queue so they don't stall the run
+        scraped = 0
+        queue = deque((index, prop_url, 1, 0) for index, prop_url in enumerate(property_urls, 1))
+        while queue:
+            index, prop_url, attempt, not_before = queue.popleft()
+            time.sleep(max(0, not_before - time.monotonic()))
+            print(f"[{index}/{len(property_urls)}] Scraping {prop_url}")
+            result = self._scrape_property(prop_url, attempt)
+            if result is None:
+                queue.append((index, prop_url, attempt + 1, time.monotonic() + self.retry_policy.delay(attempt)))
+            elif result:
+                scraped += 1
+        
+        return scraped
+    
+    def _scrape_incremental(self, property_urls: List[str], previous: Dict[str, Dict]) -> int:
+        """Only scrape new or changed listings, carrying the rest forward from the last snapshot"""
+        previous_summaries = self.history.get('summaries', {})
+        
+        carried = 0
+        to_scrape = []
+        for prop_url in property_urls:
+            prop_id = self.property_id_from_url(prop_url)
+            summary = self.listing_summaries.get(prop_url)
+            unchanged = (
+                prop_id in previous
+                and summary is not None
+                and previous_summaries.get(prop_id) == self._summary_hash(summary)
+            )
+            if unchanged:
+                self.emit_property(prop_url, previous[prop_id])
+                carried += 1
+            else:
+                to_scrape.append(prop_url)
+        
+        print(f"\nIncremental: {len(to_scrape)} new/changed, {carried} unchanged carried forward")
+        return carried + self._scrape_details(to_scrape)
+    
+    def _carry_undiscovered(self, property_urls: List[str], previous: Dict[str, Dict]) -> int:
+        """Keep listings that discovery stopped before reaching, as in the last snapshot"""
+        discovered = {self.property_id_from_url(url) for url in property_urls}
+        discovered |= {prop.get('property_id') or prop.get('url') for prop in self.iter_properties()}
+        carried = 0
+        
+        for prop_id, prop in previous.items():
+            if prop_id not in discovered:
+                self.emit_property(prop.get('url') or prop_id, prop)
+                carried += 1
+        
+        if carried:
+            print(f"Carried forward {carried} listings past the discovery cut-off")
+        return carried
+    
+    def run(self, full_scrape: bool = True, incremental: bool = False, resume: bool = False):
+        """Main execution method
+        
+        With incremental=True only listings that are new, or whose marketplace
+        card changed since the last run, get their detail page scraped.
+        With resume=True an interrupted run continues from its checkpoint.
+        Phase timings are written to metrics.json in the output directory,
+        whether or not the run succeeds; only the latest run is kept.
+        """
         print(f"\n{'='*60}")
         print(f"Starting scrape for {self.platform_name}")
         print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}\n")
         
+        self.metrics.reset()
+        status = 'failed'
+        
         try:
-            self.setup_driver(headless=True)
+            # Read once per run; the scrape, diff and history passes share them
+            self.history = self.load_history()
+            previous_snapshot = self.load_previous_snapshot()
             
-            print(f"Scraping marketplace listings...")
-            property_urls = self.scrape_marketplace()
-            print(f"Found {len(property_urls)} properties")
+            if self.requires_browser:
+                with self.metrics.span('setup_driver'):
+                    self.setup_driver(headless=True)
+            
+            self.incremental = incremental
+            property_urls = self._resume_run() if resume else None
+            if property_urls is None:
+                print(f"Scraping marketplace listings...")
+                with self.metrics.span('scrape_marketplace'):
+                    property_urls = self.scrape_marketplace()
+                print(f"Found {len(property_urls)} properties")
+                
+                self.snapshot = SnapshotWriter(self.output_dir)
+                self.checkpoint.start(property_urls, self.snapshot.path, self.listing_summaries, self.discovery_truncated)
             
             if full_scrape:
-                print(f"\nScraping detailed information...")
-                for i, prop_url in enumerate(property_urls, 1):
-                    print(f"[{i}/{len(property_urls)}] Scraping {prop_url}")
-                    try:
-                        details = self.scrape_property_details(prop_url)
-                        if details:
-                            self.properties.append(details)
-                        time.sleep(2)  # Be respectful to servers
-                    except Exception as e:
-                        print(f"Error scraping {prop_url}: {str(e)}")
-                        continue
-            
-            self.save_properties(format='json')
-            self.save_properties(format='csv')
+                if incremental:
+                    self._scrape_incremental(property_urls, previous_snapshot)
+                else:
+                    print(f"\nScraping detailed information...")
+                    self._scrape_details(property_urls)
+                if self.discovery_truncated:
+                    self._carry_undiscovered(property_urls, previous_snapshot)
+            self.snapshot.finalize()
+            
+            with self.metrics.span('download_wait'):
+                download_stats = self.downloader.wait()
+            if any(download_stats.values()):
+                print(f"\nDocuments: {download_stats['downloaded']} downloaded, "
+                      f"{download_stats['not_modified']} unchanged, "
+                      f"{download_stats['deduplicated']} deduplicated, "
+                      f"{download_stats['retried']} retried, "
+                      f"{download_stats['failed']} failed")
+            print(f"Request rates (req/s): {self.rate_limiter.rates()}")
+            
+            for snapshot_format in self.snapshot_formats:
+                with self.metrics.span(f"save_properties:{snapshot_format}"):
+                    self.save_properties(format=snapshot_format)
+            if os.getenv('PROPERTY_DB'):
+                with self.metrics.span('save_properties:sqlite'):
+                    self.save_properties(format='sqlite')
             
             new_props = self.detect_new_properties()
             if new_props:
@@ -182,15 +938,40 @@ class BaseScraper(ABC):
                 for prop in new_props:
                     print(f"  - {prop.get('title', 'Unknown')}")
             
+            with self.metrics.span('record_changes'):
+                self.record_changes(previous_snapshot)
             self.update_property_history()
+            self.snapshot.discard()
+            self.checkpoint.clear()
+            status = 'success'
             
             print(f"\n{'='*60}")
             print(f"Scraping completed for {self.platform_name}")
-            print(f"Total properties: {len(self.properties)}")
+            print(f"Total properties: {self.property_count}")
             print(f"{'='*60}\n")
             
         except Exception as e:
             print(f"Error during scraping: {str(e)}")
             raise
         finally:
+            if self.snapshot is not None:
+                self.snapshot.close()
             self.close_driver()
+            self.downloader.close()
+            self.save_metrics(status)
+    
+    def save_metrics(self, status: str) -> Optional[str]:
+        """Write the run's per-phase timings (count, total, p50, p95, max seconds) as JSON"""
+        try:
+            path = self.metrics.save(self.output_dir, {
+                'status': status,
+                'properties': self.property_count,
+                'downloads': dict(self.downloader.stats),
+                'request_rates': self.rate_limiter.rates()
+            })
+        except Exception as e:
+            print(f"Error saving run metrics: {str(e)}")
+            return None
+        
+        print(f"Run metrics saved to {path}")
+        return path
@@ -0,0 +1,69 @@
+"""
+Content-addressed blob store shared by all platforms
+Documents are stored once under data/blobs/<aa>/<sha256>, and a small
+per-platform index maps (property_id, doc_type) to the hashes it references
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+
+class BlobStore:
+    """sha256-keyed file store with per-platform document indexes"""
+    
+    def __init__(self, root: str = "data/blobs"):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.index_dir = os.path.join(root, 'index')
+        
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+    
+    def path(self, digest: str) -> str:
+        """Path of the blob with the given sha256 hex digest"""
+        return os.path.join(self.root, digest[:2], digest)
+    
+    def exists(self, digest: Optional[str]) -> bool:
+        return bool(digest) and os.path.exists(self.path(digest))
+    
+    def temp_path(self, key: str) -> str:
+        """Stable partial-download path for a key (e.g. a URL), so downloads can resume"""
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.tmp_dir, f"{name}.part")
+    
+    def put(self, temp_path: str, digest: str) -> bool:
+        """Move a finished temp file into the store; returns False if the blob already existed"""
+        if self.exists(digest):
+            os.remove(temp_path)
+            return False
+        
+        target = self.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+        return True
+    
+    def _index_file(self, platform: str) -> str:
+        return os.path.join(self.index_dir, f"{platform}.json")
+    
+    def load_index(self, platform: str) -> Dict:
+        """Load a platform's url metadata and (property_id, doc_type) -> hashes map"""
+        index_file = self._index_file(platform)
+        
+        if os.path.exists(index_file):
+            try:
+                with open(index_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Could not read blob index {index_file}: {str(e)}")
+        
+        return {'urls': {}, 'documents': {}}
+    
+    def save_index(self, platform: str, index: Dict):
+        """Atomically write a platform's index"""
+        index_file = self._index_file(platform)
+        tmp_file = f"{index_file}.tmp"
+        
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, index_file)
@@ -0,0 +1,111 @@
+"""
+Long-lived browser session for scheduled scraping
+Keeps one Chrome instance warm between scheduler cycles, health-checks it
+before each use and restarts it when it has died. The chromedriver path is
+resolved once and cached on disk, so a new cycle (or process) doesn't ask
+webdriver-manager to look it up over the network again
+"""
+import os
+import threading
+from typing import Callable
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+DRIVER_PATH_CACHE = os.path.expanduser(os.getenv('CHROMEDRIVER_CACHE', '~/.cache/fogfeed/chromedriver_path'))
+
+_driver_path = None
+
+
+def chromedriver_path() -> str:
+    """Local chromedriver binary: CHROMEDRIVER_PATH, the cached path, or a fresh install"""
+    global _driver_path
+    
+    if _driver_path and os.path.exists(_driver_path):
+        return _driver_path
+    
+    path = os.getenv('CHROMEDRIVER_PATH')
+    if not path and os.path.exists(DRIVER_PATH_CACHE):
+        with open(DRIVER_PATH_CACHE, 'r') as f:
+            path = f.read().strip()
+    
+    if not path or not os.path.exists(path):
+        path = ChromeDriverManager().install()
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE, 'w') as f:
+            f.write(path)
+    
+    _driver_path = path
+    return path
+
+
+def forget_chromedriver_path():
+    """Drop the cached path, e.g. after Chrome updated and the driver no longer matches"""
+    global _driver_path
+    _driver_path = None
+    if os.path.exists(DRIVER_PATH_CACHE):
+        os.remove(DRIVER_PATH_CACHE)
+
+
+def driver_alive(driver) -> bool:
+    """Cheap round-trip to check the browser still answers"""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class BrowserSession:
+    """A WebDriver that outlives individual scraper runs"""
+    
+    def __init__(self):
+        self._driver = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+    
+    def acquire(self, create_driver: Callable):
+        """Hand out the warm driver, (re)starting it with create_driver() if needed"""
+        with self._lock:
+            if self._driver is not None and not driver_alive(self._driver):
+                print("Browser session died, restarting Chrome")
+                self._quit()
+                self.restarts += 1
+            
+            if self._driver is None:
+                self._driver = create_driver()
+            
+            return self._driver
+    
+    def release(self, driver):
+        """Return the driver after a run, leaving it on a blank page"""
+        with self._lock:
+            if driver is not self._driver:
+                try:
+                    driver.quit()  # Not ours (replaced by a restart), don't leak it
+                except Exception:
+                    pass
+                return
+            try:
+                driver.get("about:blank")
+            except Exception:
+                self._quit()
+    
+    def restart(self, create_driver: Callable):
+        """Replace the driver, e.g. after it crashed mid-run"""
+        with self._lock:
+            self._quit()
+            self.restarts += 1
+            self._driver = create_driver()
+            return self._driver
+    
+    def _quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+    
+    def close(self):
+        with self._lock:
+            self._quit()
@@ -0,0 +1,73 @@
+"""
+Append-only property change log
+Each scrape cycle appends added/removed/changed events (with field-level
+diffs) to data/<platform>/changes.jsonl, so listing history is never lost
+"""
+import os
+import json
+from datetime import datetime
+from typing import List, Dict, Optional, Iterator
+
+
+def events_from_diff(platform: str, diff: Dict, previous: Dict[str, Dict], titles: Dict[str, str], timestamp: Optional[str] = None) -> List[Dict]:
+    """Build added/changed/removed events from a diff_snapshots() result"""
+    timestamp = timestamp or datetime.now().isoformat()
+    events = []
+    
+    for prop_id in diff['added']:
+        events.append({'timestamp': timestamp, 'platform': platform, 'property_id': prop_id,
+                       'event': 'added', 'title': titles.get(prop_id)})
+    
+    for prop_id, changes in diff['changed'].items():
+        events.append({'timestamp': timestamp, 'platform': platform, 'property_id': prop_id,
+                       'event': 'changed', 'title': titles.get(prop_id), 'changes': changes})
+    
+    # An empty scrape usually means the marketplace failed to load, not that
+    # every listing disappeared
+    if diff['hashes']:
+        for prop_id in diff['removed']:
+            events.append({'timestamp': timestamp, 'platform': platform, 'property_id': prop_id,
+                           'event': 'removed', 'title': previous[prop_id].get('title')})
+    
+    return events
+
+
+class ChangeLog:
+    """JSONL event log for one platform"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def append(self, events: List[Dict]):
+        """Append events; one line each, flushed to disk before returning"""
+        if not events:
+            return
+        
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def read(self, since: Optional[str] = None, until: Optional[str] = None, event: Optional[str] = None) -> Iterator[Dict]:
+        """Events in [since, until), oldest first; timestamps compare as ISO strings"""
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from an interrupted write
+                
+                timestamp = entry.get('timestamp', '')
+                if since and timestamp < since:
+                    continue
+                if until and timestamp >= until:
+                    break  # The log is append-only, so it is in time order
+                if event and entry.get('event') != event:
+                    continue
+                yield entry
@@ -0,0 +1,254 @@
+"""
+Background document downloader shared by all platform scrapers
+Streams files into the content-addressed BlobStore through a pooled session,
+skips unchanged files with conditional requests and resumes partial downloads
+"""
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from urllib.parse import urlparse
+from typing import Dict, Optional
+from blob_store import BlobStore
+from rate_limiter import HostRateLimiter, retry_after_seconds
+from retry_policy import RetryPolicy
+from run_metrics import RunMetrics
+
+
+class DocumentDownloader:
+    """Download queue that keeps document I/O off the page-scraping path"""
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, session, blob_store: BlobStore, platform: str, max_workers: int = 4, max_per_host: int = 2, timeout: int = 30,
+                 rate_limiter: Optional[HostRateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[RunMetrics] = None):
+        self.session = session
+        self.blob_store = blob_store
+        self.platform = platform
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics or RunMetrics(platform)
+        
+        self._executor = None
+        self._futures = []
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._in_flight = {}
+        self._index = blob_store.load_index(platform)
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'deduplicated': 0, 'retried': 0, 'failed': 0}
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(max(1, self.max_per_host))
+            return self._host_slots[host]
+    
+    def submit(self, url: str, property_id: str, doc_type: str) -> Future:
+        """Queue a download; the future resolves to the blob's sha256 (None on failure)
+        
+        A URL that is already downloading shares that download's future, so
+        two threads never write the same .part file; the extra property is
+        indexed against the blob once it lands.
+        """
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is None:
+                future = self._in_flight[url] = Future()
+                queued = False
+            else:
+                queued = True
+        
+        if queued:
+            def index_alias(done: Future):
+                if done.result():
+                    self._record(url, property_id, doc_type, done.result())
+            future.add_done_callback(index_alias)
+        else:
+            self._enqueue(url, property_id, doc_type, future)
+        return future
+    
+    def _enqueue(self, url: str, property_id: str, doc_type: str, future: Future, attempt: int = 1, not_before: float = 0):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='download')
+            self._futures.append(self._executor.submit(self._attempt, url, property_id, doc_type, future, attempt, not_before))
+    
+    def _attempt(self, url: str, property_id: str, doc_type: str, future: Future, attempt: int, not_before: float):
+        """Run one download attempt, re-queueing it behind the other downloads on a retryable error"""
+        time.sleep(max(0, not_before - time.monotonic()))
+        
+        try:
+            with self.metrics.span('download_file'):
+                digest = self._download(url, property_id, doc_type)
+        except Exception as e:
+            if self.retry_policy.should_retry(e, attempt):
+                with self._lock:
+                    self.stats['retried'] += 1
+                print(f"Error downloading {url} (attempt {attempt}/{self.retry_policy.max_attempts}), retrying later: {str(e)}")
+                self._enqueue(url, property_id, doc_type, future, attempt + 1, time.monotonic() + self.retry_policy.delay(attempt))
+                return
+            
+            with self._lock:
+                self.stats['failed'] += 1
+            print(f"Error downloading {url}: {str(e)}")
+            digest = None
+        
+        with self._lock:
+            self._in_flight.pop(url, None)
+        future.set_result(digest)
+    
+    def blob_hash(self, url: str) -> Optional[str]:
+        """sha256 of the last successful download of a URL"""
+        with self._lock:
+            return self._index['urls'].get(url, {}).get('sha256')
+    
+    def _record(self, url: str, property_id: str, doc_type: str, digest: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            entry = self._index['urls'].setdefault(url, {})
+            entry['sha256'] = digest
+            if etag or last_modified:
+                entry['etag'] = etag
+                entry['last_modified'] = last_modified
+            
+            hashes = self._index['documents'].setdefault(f"{property_id}/{doc_type}", [])
+            if digest not in hashes:
+                hashes.append(digest)
+    
+    @staticmethod
+    def _discard_partial(part_path: str):
+        for path in (part_path, f"{part_path}.validator"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    @staticmethod
+    def _range_validator(response) -> Optional[str]:
+        """Strong ETag, else Last-Modified, of a response - what If-Range accepts"""
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('Last-Modified')
+    
+    def _download(self, url: str, property_id: str, doc_type: str, resume: bool = True) -> Optional[str]:
+        part_path = self.blob_store.temp_path(url)
+        validator_path = f"{part_path}.validator"
+        
+        with self._lock:
+            previous = dict(self._index['urls'].get(url, {}))
+        
+        headers = {}
+        if self.blob_store.exists(previous.get('sha256')):
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
+        
+        # A partial file is only resumed against the validator of the response
+        # that started it; without If-Range a changed file would be appended
+        # to stale bytes
+        resume_from = 0
+        if os.path.exists(part_path):
+            validator = None
+            if resume and os.path.exists(validator_path):
+                with open(validator_path, 'r', encoding='utf-8') as f:
+                    validator = f.read().strip()
+            if validator:
+                resume_from = os.path.getsize(part_path)
+                headers['Range'] = f"bytes={resume_from}-"
+                headers['If-Range'] = validator
+            else:
+                self._discard_partial(part_path)
+        
+        with self._host_slot(url):
+            with self.rate_limiter.throttle(url) as outcome:
+                response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+                outcome['status'] = response.status_code
+                outcome['retry_after'] = retry_after_seconds(response)
+            
+            with response:
+                if response.status_code == 304:
+                    self._record(url, property_id, doc_type, previous['sha256'])
+                    with self._lock:
+                        self.stats['not_modified'] += 1
+                    return previous['sha256']
+                
+                # 416 (the partial file is already whole, or longer than the
+                # file now is) or a range that doesn't continue it
+                restart = resume_from > 0 and (
+                    response.status_code == 416
+                    or (response.status_code == 206
+                        and not response.headers.get('Content-Range', '').startswith(f"bytes {resume_from}-"))
+                )
+                
+                if not restart:
+                    response.raise_for_status()
+                    
+                    sha256 = hashlib.sha256()
+                    if response.status_code == 206 and resume_from:
+                        mode = 'ab'
+                        with open(part_path, 'rb') as f:
+                            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                                sha256.update(chunk)
+                    else:
+                        mode = 'wb'
+                        validator = self._range_validator(response)
+                        if validator:
+                            with open(validator_path, 'w', encoding='utf-8') as f:
+                                f.write(validator)
+                        elif os.path.exists(validator_path):
+                            os.remove(validator_path)
+                    
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                                sha256.update(chunk)
+                    
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+        
+        if restart:
+            print(f"Cannot resume partial download of {url} (HTTP {response.status_code}), starting over")
+            self._discard_partial(part_path)
+            return self._download(url, property_id, doc_type, resume=False)
+        
+        digest = sha256.hexdigest()
+        is_new = self.blob_store.put(part_path, digest)
+        self._discard_partial(part_path)
+        self._record(url, property_id, doc_type, digest, etag, last_modified)
+        
+        with self._lock:
+            self.stats['downloaded' if is_new else 'deduplicated'] += 1
+        
+        print(f"Downloaded: {property_id} {doc_type} -> {digest[:12]}")
+        return digest
+    
+    def wait(self) -> Dict:
+        """Block until every queued download, retries included, has finished and persist the index"""
+        waited = False
+        while True:
+            with self._lock:
+                futures, self._futures = self._futures, []
+            if not futures:
+                break
+            for future in futures:
+                future.result()
+            waited = True
+        
+        if waited:
+            with self._lock:
+                self.blob_store.save_index(self.platform, self._index)
+        
+        return dict(self.stats)
+    
+    def close(self):
+        """Finish outstanding downloads and stop the worker threads"""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,103 @@
+"""
+Precompiled text extraction rules shared by the scrapers
+TextRules applies a table of regex rules to page text; KeywordClassifier
+maps keywords to labels (e.g. document types) from an ordered table instead
+of an if/elif chain
+
+Benchmark a scraper's rule table against page text captured with
+LOFTY_PAGE_CAPTURE=<dir> python scrapers/lofty_scraper_enhanced.py:
+    python extraction_rules.py <dir>
+"""
+import re
+import time
+from typing import Dict, List, Tuple
+
+
+class TextRules:
+    """Table of (field, pattern, flags, template) rules, compiled once
+    
+    The template is formatted with the whole match as {0} and the pattern's
+    groups as {1}, {2}, ... A field can have several rules; the first one
+    that matches wins. Each rule is one search of its own compiled pattern.
+    """
+    
+    def __init__(self, rules: List[Tuple[str, str, int, str]]):
+        self.rules = [(field, re.compile(pattern, flags), template) for field, pattern, flags, template in rules]
+    
+    def extract(self, text: str) -> Dict[str, str]:
+        values = {}
+        for field, pattern, template in self.rules:
+            if field in values:
+                continue
+            match = pattern.search(text)
+            if match:
+                values[field] = template.format(match.group(0), *match.groups())
+        return values
+
+
+class KeywordClassifier:
+    """Ordered (keyword, label, where) table; where is 'text', 'href' or 'both'
+    
+    The first keyword found wins, so more specific keywords go first.
+    """
+    
+    def __init__(self, keywords: List[Tuple[str, str, str]], default: str = 'unknown'):
+        self.keywords = [(keyword.lower(), label, where) for keyword, label, where in keywords]
+        self.default = default
+    
+    def classify(self, text: str, href: str = '') -> str:
+        text = (text or '').lower()
+        href = (href or '').lower()
+        
+        for keyword, label, where in self.keywords:
+            if where != 'href' and keyword in text:
+                return label
+            if where != 'text' and keyword in href:
+                return label
+        
+        return self.default
+
+
+def benchmark(rules: TextRules, texts: List[str], repeat: int = 20) -> Dict:
+    """Time a rule table on page texts: per-page total, per-rule cost and hit counts"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            rules.extract(text)
+    per_page = (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+    
+    per_rule = {}
+    for field, pattern, _ in rules.rules:
+        hits = sum(1 for text in texts if pattern.search(text))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                pattern.search(text)
+        cost = (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+        per_rule[f"{field} /{pattern.pattern}/"] = {'us': round(cost, 1), 'hits': hits}
+    
+    return {'pages': len(texts), 'us_per_page': round(per_page, 1), 'rules': per_rule}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import glob
+    import json
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from scrapers.lofty_scraper_enhanced import LoftyScraperEnhanced
+    
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else os.getenv('LOFTY_PAGE_CAPTURE')
+    if not fixtures_dir:
+        print("Usage: python extraction_rules.py <dir of page text captured with LOFTY_PAGE_CAPTURE=<dir>>")
+        sys.exit(2)
+    texts = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    
+    if not texts:
+        print(f"No page fixtures in {fixtures_dir} (capture some with LOFTY_PAGE_CAPTURE=<dir>)")
+        sys.exit(1)
+    
+    print(json.dumps(benchmark(LoftyScraperEnhanced.TEXT_RULES, texts), indent=2))
@@ -0,0 +1,125 @@
+"""
+Declarative field specs for detail pages
+A spec maps field names to selectors; BaseScraper.extract_fields() runs the
+whole spec in the page with one execute_script call, or walks it over the
+parsed HTML when the page was fetched statically
+
+Each field is a dict with:
+    css / xpath   selector, matches taken in document order
+    scan          only look at the first N matches
+    parent        read the match's parent element instead
+    attr          read an attribute (resolved like WebElement.get_attribute)
+                  instead of the element's text
+    contains      keep only values containing one of these substrings
+    max_length    truncate each value
+    all           collect every kept value instead of the first
+    limit         with all, stop after N values
+    join          with all, join the values into one string
+Single-value fields are left out when nothing matches; `all` fields are
+always set
+"""
+from typing import Dict, List, Any
+from selenium.webdriver.common.by import By
+
+
+def text_xpath(*keywords: str) -> str:
+    """XPath for elements whose own text contains any of the keywords"""
+    return "//*[" + " or ".join(f"contains(text(), '{keyword}')" for keyword in keywords) + "]"
+
+
+EXTRACT_SCRIPT = """
+var spec = arguments[0], out = {};
+
+function select(field) {
+    if (field.xpath) {
+        var result = document.evaluate(field.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(field.css));
+}
+
+function read(el, field) {
+    if (field.parent) el = el.parentElement || el;
+    if (field.attr) {
+        var value = el[field.attr];
+        return typeof value === 'string' ? value : el.getAttribute(field.attr);
+    }
+    return (el.innerText || '').trim();
+}
+
+function keep(value, field) {
+    if (value === null || value === undefined) return false;
+    if (field.attr && !value) return false;
+    if (!field.contains) return true;
+    return [].concat(field.contains).some(function (s) { return value.indexOf(s) !== -1; });
+}
+
+Object.keys(spec).forEach(function (name) {
+    var field = spec[name];
+    try {
+        var nodes = select(field);
+        if (field.scan) nodes = nodes.slice(0, field.scan);
+        var values = [];
+        for (var i = 0; i < nodes.length; i++) {
+            var value = read(nodes[i], field);
+            if (!keep(value, field)) continue;
+            if (field.max_length) value = value.slice(0, field.max_length);
+            values.push(value);
+            if (!field.all || (field.limit && values.length >= field.limit)) break;
+        }
+        if (field.all) out[name] = field.join !== undefined ? values.join(field.join) : values;
+        else if (values.length) out[name] = values[0];
+    } catch (e) {}
+});
+
+return out;
+"""
+
+
+def _keep(value: Any, field: Dict) -> bool:
+    if value is None:
+        return False
+    if field.get('attr') and not value:
+        return False
+    contains = field.get('contains')
+    if not contains:
+        return True
+    return any(s in value for s in ([contains] if isinstance(contains, str) else contains))
+
+
+def evaluate_spec(driver, spec: Dict[str, Dict]) -> Dict[str, Any]:
+    """Same semantics as EXTRACT_SCRIPT, through find_elements (for StaticDriver pages)"""
+    out = {}
+    
+    for name, field in spec.items():
+        try:
+            if field.get('xpath'):
+                elements = driver.find_elements(By.XPATH, field['xpath'])
+            else:
+                elements = driver.find_elements(By.CSS_SELECTOR, field['css'])
+            if field.get('scan'):
+                elements = elements[:field['scan']]
+            
+            values: List[str] = []
+            for element in elements:
+                if field.get('parent'):
+                    element = element.find_element(By.XPATH, "./..")
+                value = element.get_attribute(field['attr']) if field.get('attr') else element.text
+                if not _keep(value, field):
+                    continue
+                if field.get('max_length'):
+                    value = value[:field['max_length']]
+                values.append(value)
+                if not field.get('all') or (field.get('limit') and len(values) >= field['limit']):
+                    break
+            
+            if field.get('all'):
+                out[name] = field['join'].join(values) if 'join' in field else values
+            elif values:
+                out[name] = values[0]
+        except Exception:
+            continue
+    
+    return out
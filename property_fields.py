@@ -0,0 +1,33 @@
+"""
+Normalization helpers for searchable property fields
+Shared by PropertyDataAPI and PropertyStore so both index data the same way
+"""
+import re
+from typing import Any, Dict, List
+
+
+def parse_percent(value: Any) -> float:
+    """Parse strings like "12.3%" into 12.3 (NaN when unparseable)"""
+    try:
+        return float(value.replace('%', ''))
+    except (AttributeError, ValueError):
+        return float('nan')
+
+
+def parse_money(value: Any) -> float:
+    """Parse strings like "$123,456" into 123456.0 (NaN when unparseable)"""
+    try:
+        return float(value.replace('$', '').replace(',', ''))
+    except (AttributeError, ValueError):
+        return float('nan')
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    return re.findall(r'[a-z0-9]+', text.lower()) if isinstance(text, str) else []
+
+
+def location_text(prop: Dict) -> str:
+    """All location fields of a property, joined for indexing"""
+    fields = (prop.get('city_state'), prop.get('location'), prop.get('address'))
+    return ' '.join(field for field in fields if isinstance(field, str))
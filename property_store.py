@@ -0,0 +1,205 @@
+"""
+Optional SQLite-backed property store
+Scrapers upsert each run's snapshot into `properties` (current listings) and
+append changed records to `property_versions`; PropertyDataAPI can read from
+it instead of parsing timestamped JSON files
+"""
+import json
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional
+from property_fields import parse_percent, parse_money, tokenize, location_text
+from record_diff import record_hash
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS properties (
+    platform TEXT NOT NULL,
+    property_id TEXT NOT NULL,
+    url TEXT,
+    title TEXT,
+    price REAL,
+    annual_return REAL,
+    property_type TEXT,
+    type_tokens TEXT,
+    location_tokens TEXT,
+    scraped_at TEXT,
+    updated_at TEXT NOT NULL,
+    record_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (platform, property_id)
+);
+
+CREATE TABLE IF NOT EXISTS property_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform TEXT NOT NULL,
+    property_id TEXT NOT NULL,
+    record_hash TEXT NOT NULL,
+    scraped_at TEXT,
+    recorded_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_properties_property_id ON properties (property_id);
+CREATE INDEX IF NOT EXISTS idx_properties_price ON properties (price);
+CREATE INDEX IF NOT EXISTS idx_properties_return ON properties (annual_return);
+CREATE INDEX IF NOT EXISTS idx_versions_property ON property_versions (platform, property_id, recorded_at);
+"""
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class PropertyStore:
+    """SQLite store (WAL mode) shared by the scrapers and PropertyDataAPI"""
+    
+    def __init__(self, db_path: str = "data/properties.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run while a scraper writes"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def save_snapshot(self, platform: str, properties: List[Dict]) -> Dict:
+        """Replace a platform's current listings, versioning records whose content changed"""
+        now = datetime.now().isoformat()
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        
+        with self._connection() as conn:
+            existing = {
+                row['property_id']: row['record_hash']
+                for row in conn.execute("SELECT property_id, record_hash FROM properties WHERE platform = ?", (platform,))
+            }
+            
+            seen = set()
+            for prop in properties:
+                prop_id = prop.get('property_id') or prop.get('url')
+                if not prop_id or prop_id in seen:
+                    continue
+                seen.add(prop_id)
+                
+                digest = record_hash(prop)
+                if existing.get(prop_id) == digest:
+                    stats['unchanged'] += 1
+                    continue
+                
+                stats['updated' if prop_id in existing else 'inserted'] += 1
+                data = json.dumps(prop, ensure_ascii=False)
+                
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO properties
+                        (platform, property_id, url, title, price, annual_return, property_type,
+                         type_tokens, location_tokens, scraped_at, updated_at, record_hash, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        platform, prop_id, prop.get('url'), prop.get('title'),
+                        _nullable(parse_money(prop.get('estimated_price', '$0'))),
+                        _nullable(parse_percent(prop.get('projected_annual_return', '0%'))),
+                        prop.get('property_type'),
+                        ' '.join(tokenize(prop.get('property_type'))),
+                        ' '.join(tokenize(location_text(prop))),
+                        prop.get('scraped_at'), now, digest, data
+                    )
+                )
+                conn.execute(
+                    "INSERT INTO property_versions (platform, property_id, record_hash, scraped_at, recorded_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    (platform, prop_id, digest, prop.get('scraped_at'), now, data)
+                )
+            
+            removed = [prop_id for prop_id in existing if prop_id not in seen]
+            conn.executemany(
+                "DELETE FROM properties WHERE platform = ? AND property_id = ?",
+                [(platform, prop_id) for prop_id in removed]
+            )
+            stats['removed'] = len(removed)
+            
+            conn.execute("UPDATE properties SET updated_at = ? WHERE platform = ?", (now, platform))
+        
+        return stats
+    
+    def get_platforms(self) -> List[str]:
+        rows = self._connection().execute("SELECT DISTINCT platform FROM properties ORDER BY platform")
+        return [row['platform'] for row in rows]
+    
+    def get_properties(self, platform: Optional[str] = None) -> List[Dict]:
+        """Current listings, optionally for one platform"""
+        if platform:
+            rows = self._connection().execute("SELECT data FROM properties WHERE platform = ?", (platform,))
+        else:
+            rows = self._connection().execute("SELECT data FROM properties")
+        return [json.loads(row['data']) for row in rows]
+    
+    def get_property(self, property_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT data FROM properties WHERE property_id = ? LIMIT 1", (property_id,)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+    
+    def get_versions(self, platform: str, property_id: str) -> List[Dict]:
+        """Every stored version of a listing, oldest first"""
+        rows = self._connection().execute(
+            "SELECT recorded_at, data FROM property_versions WHERE platform = ? AND property_id = ? ORDER BY id",
+            (platform, property_id)
+        )
+        return [{'recorded_at': row['recorded_at'], 'property': json.loads(row['data'])} for row in rows]
+    
+    def get_platform_stats(self) -> Dict:
+        rows = self._connection().execute(
+            "SELECT platform, COUNT(*) AS total, MAX(updated_at) AS last_updated FROM properties GROUP BY platform"
+        )
+        return {
+            row['platform']: {
+                'total_properties': row['total'],
+                'last_updated': datetime.fromisoformat(row['last_updated']).strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for row in rows
+        }
+    
+    def search(self,
+               min_return: Optional[float] = None,
+               max_price: Optional[float] = None,
+               property_type: Optional[str] = None,
+               location: Optional[str] = None) -> List[Dict]:
+        """Search with the same semantics as PropertyDataAPI.search_properties"""
+        clauses = []
+        params = []
+        
+        if min_return:
+            clauses.append("(annual_return IS NULL OR annual_return >= ?)")
+            params.append(min_return)
+        
+        if max_price:
+            clauses.append("(price IS NULL OR price <= ?)")
+            params.append(max_price)
+        
+        for query, column in ((property_type, 'type_tokens'), (location, 'location_tokens')):
+            if query:
+                tokens = tokenize(query)
+                if not tokens:
+                    return []
+                for token in tokens:
+                    # Token-prefix match: the token starts the column or follows a space
+                    clauses.append(f"(' ' || {column}) LIKE ?")
+                    params.append(f"% {token}%")
+        
+        sql = "SELECT data FROM properties"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        
+        return [json.loads(row['data']) for row in self._connection().execute(sql, params)]
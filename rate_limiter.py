@@ -0,0 +1,106 @@
+"""
+Adaptive per-host rate limiting
+One token bucket per host, shared by page loads, API calls and document
+downloads. The rate speeds up while a host answers quickly and backs off on
+429/5xx, errors or slow responses, replacing hand-tuned sleeps
+"""
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from typing import Dict, Optional
+
+
+class HostRateLimiter:
+    """Token bucket per host with multiplicative increase / decrease"""
+    
+    def __init__(self, rate: float = 0.5, max_rate: float = 4.0, min_rate: float = 0.05,
+                 burst: float = 1.0, slow_after: float = 10.0):
+        self.initial_rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.slow_after = slow_after
+        
+        self._lock = threading.Lock()
+        self._buckets = {}
+    
+    def _bucket(self, host: str) -> Dict:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = {'rate': self.initial_rate, 'tokens': self.burst, 'updated': time.monotonic(), 'paused_until': 0.0}
+            self._buckets[host] = bucket
+        return bucket
+    
+    def acquire(self, url: str):
+        """Block until the URL's host has a token to spend"""
+        host = urlparse(url).netloc
+        
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket['tokens'] = min(self.burst, bucket['tokens'] + (now - bucket['updated']) * bucket['rate'])
+                bucket['updated'] = now
+                
+                wait = bucket['paused_until'] - now
+                if wait <= 0 and bucket['tokens'] >= 1:
+                    bucket['tokens'] -= 1
+                    return
+                wait = max(wait, (1 - bucket['tokens']) / bucket['rate'])
+            
+            time.sleep(wait)
+    
+    def record(self, url: str, status: Optional[int] = None, elapsed: float = 0.0,
+               failed: bool = False, slow: bool = False, retry_after: Optional[float] = None):
+        """Adapt the host's rate to how a request went"""
+        host = urlparse(url).netloc
+        
+        with self._lock:
+            bucket = self._bucket(host)
+            
+            if failed or status == 429 or (status is not None and status >= 500):
+                bucket['rate'] = max(self.min_rate, bucket['rate'] / 2)
+                pause = retry_after if retry_after is not None else 1 / bucket['rate']
+                bucket['paused_until'] = max(bucket['paused_until'], time.monotonic() + pause)
+            elif slow or elapsed > self.slow_after:
+                bucket['rate'] = max(self.min_rate, bucket['rate'] * 0.8)
+            elif status is None or status < 400:
+                bucket['rate'] = min(self.max_rate, bucket['rate'] * 1.1)
+    
+    @contextmanager
+    def throttle(self, url: str):
+        """Wait for a token, then adapt to the request made inside the block
+        
+        Set outcome['status'] (and optionally outcome['retry_after'] or
+        outcome['slow']) inside the block; an exception counts as a failure,
+        or as its response's status for requests' HTTPError.
+        """
+        self.acquire(url)
+        outcome = {'status': None, 'retry_after': None, 'slow': False}
+        start = time.monotonic()
+        
+        try:
+            yield outcome
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            status = getattr(response, 'status_code', None)
+            self.record(url, status=status, elapsed=time.monotonic() - start, failed=status is None,
+                        retry_after=retry_after_seconds(response))
+            raise
+        else:
+            self.record(url, status=outcome['status'], elapsed=time.monotonic() - start,
+                        slow=outcome['slow'], retry_after=outcome['retry_after'])
+    
+    def rates(self) -> Dict[str, float]:
+        """Current requests/second per host"""
+        with self._lock:
+            return {host: round(bucket['rate'], 2) for host, bucket in self._buckets.items()}
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Numeric Retry-After header of a response, if any"""
+    try:
+        return float(response.headers['Retry-After'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
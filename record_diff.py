@@ -0,0 +1,96 @@
+"""
+Field-level diffing between consecutive scrape snapshots
+Records are normalized and hashed so unchanged listings are skipped with a
+single digest comparison; only records whose hash differs are diffed field
+by field
+"""
+import json
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+
+# Fields that change on every scrape and say nothing about the listing
+VOLATILE_FIELDS = {'scraped_at'}
+
+EMPTY_VALUES = (None, '', [], {})
+
+
+def normalize_value(value: Any) -> Any:
+    """Collapse whitespace in scraped text so layout jitter isn't a change"""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, list):
+        return [normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def normalize_record(prop: Dict) -> Dict:
+    """Comparable form of a record: no volatile or empty fields, normalized text"""
+    normalized = {}
+    for field, value in prop.items():
+        if field in VOLATILE_FIELDS:
+            continue
+        value = normalize_value(value)
+        if value in EMPTY_VALUES:
+            continue
+        normalized[field] = value
+    return normalized
+
+
+def record_hash(prop: Dict) -> str:
+    """Digest of a record's normalized content"""
+    content = json.dumps(normalize_record(prop), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def diff_records(old: Dict, new: Dict) -> Dict[str, Dict]:
+    """Per-field {'old', 'new'} values for fields that differ after normalization"""
+    old = normalize_record(old)
+    new = normalize_record(new)
+    
+    changes = {}
+    for field in old.keys() | new.keys():
+        if old.get(field) != new.get(field):
+            changes[field] = {'old': old.get(field), 'new': new.get(field)}
+    return changes
+
+
+def diff_snapshots(previous: Dict[str, Dict], current: Iterable[Dict], previous_hashes: Optional[Dict[str, str]] = None) -> Dict:
+    """Compare the previous snapshot (keyed by ID) with the current properties
+    
+    `current` is consumed once, so it can be a stream of records.
+    
+    `previous_hashes` (from property_history.json) saves re-hashing the old
+    records; any ID missing from it is hashed from `previous`.
+    
+    Returns {'added': [ids], 'removed': [ids], 'changed': {id: field changes},
+    'unchanged': count, 'hashes': {id: hash of the current record}}
+    """
+    previous_hashes = previous_hashes or {}
+    result = {'added': [], 'removed': [], 'changed': {}, 'unchanged': 0, 'hashes': {}}
+    
+    for prop in current:
+        prop_id = prop.get('property_id') or prop.get('url')
+        digest = record_hash(prop)
+        result['hashes'][prop_id] = digest
+        
+        old = previous.get(prop_id)
+        if old is None:
+            result['added'].append(prop_id)
+            continue
+        
+        old_digest = previous_hashes.get(prop_id) or record_hash(old)
+        if old_digest == digest:
+            result['unchanged'] += 1
+            continue
+        
+        changes = diff_records(old, prop)
+        if changes:
+            result['changed'][prop_id] = changes
+        else:
+            result['unchanged'] += 1  # Stale stored hash from an older normalization
+    
+    result['removed'] = [prop_id for prop_id in previous if prop_id not in result['hashes']]
+    return result
@@ -0,0 +1,58 @@
+"""
+Retry policy for detail scrapes and document downloads
+Classifies errors as retryable (timeouts, stale elements, dropped
+connections, 408/429/5xx) or fatal (other HTTP 4xx, blocked pages, anything
+unexpected) and spaces retries with jittered exponential backoff
+"""
+import random
+import requests
+from selenium.common.exceptions import (
+    WebDriverException,
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchElementException,
+    InvalidSelectorException,
+    InvalidArgumentException
+)
+
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class BlockedPageError(Exception):
+    """The site served a block or bot-challenge page instead of content"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether another attempt could succeed where this one failed"""
+    if isinstance(error, BlockedPageError):
+        return False
+    if isinstance(error, requests.HTTPError):
+        return getattr(error.response, 'status_code', None) in RETRYABLE_STATUS
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(error, (TimeoutException, StaleElementReferenceException)):
+        return True
+    if isinstance(error, (NoSuchElementException, InvalidSelectorException, InvalidArgumentException)):
+        return False
+    # Remaining WebDriver errors are crashed or disconnected drivers; both
+    # detail loops restart a dead driver before it scrapes another page
+    return isinstance(error, WebDriverException)
+
+
+class RetryPolicy:
+    """Attempt limit and jittered exponential backoff between attempts"""
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Whether a failed attempt (1-based) gets another try"""
+        return attempt < self.max_attempts and is_retryable(error)
+    
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the attempt after this one: half fixed, half jitter"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
@@ -4,11 +4,13 @@ Main script to run all RWA platform scrapers
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'scrapers'))
 
 from scrapers.lofty_scraper import LoftyScraper
+from scrapers.lofty_api_scraper import LoftyApiScraper
 from scrapers.reental_scraper import ReentalScraper
 from scrapers.fraxtor_scraper import FraxtorScraper
 from scrapers.binaryx_scraper import BinaryxScraper
@@ -17,7 +19,84 @@ from scrapers.realt_scraper import RealTScraper
 from scrapers.propbase_scraper import PropbaseScraper
 
 
-def run_all_scrapers(include_realt=False, include_propbase=False):
+def run_scraper(platform_name, scraper_cls, scraper_kwargs=None, incremental=False, resume=False):
+    """Run a single platform scraper and return its summary entry
+    
+    Module-level so it can be shipped to worker processes: each call builds
+    its own scraper instance, and therefore its own Chrome driver.
+    """
+    scraper = scraper_cls(**(scraper_kwargs or {}))
+    
+    try:
+        print(f"\n{'='*80}")
+        print(f"🏢 {platform_name}")
+        print(f"{'='*80}\n")
+        
+        start_time = time.time()
+        scraper.run(full_scrape=True, incremental=incremental, resume=resume)
+        elapsed_time = time.time() - start_time
+        
+        result = {
+            'status': 'success',
+            'properties_count': scraper.property_count,
+            'elapsed_time': f"{elapsed_time:.2f}s",
+            'phases': scraper.metrics.summary()
+        }
+        
+        print(f"\n✅ {platform_name} completed in {elapsed_time:.2f}s")
+        print(f"   Found {scraper.property_count} properties")
+        
+    except Exception as e:
+        print(f"\n❌ Error scraping {platform_name}: {str(e)}")
+        result = {
+            'status': 'failed',
+            'error': str(e)
+        }
+    
+    return result
+
+
+def run_scrapers(scrapers, workers=1, incremental=False, resume=False):
+    """Run (platform_name, scraper_cls, scraper_kwargs) entries, optionally in parallel
+    
+    With workers > 1 each platform runs in its own process, so a cycle takes
+    roughly as long as the slowest platform. Results keep the input order.
+    """
+    results = {}
+    
+    if workers > 1:
+        print(f"⚡ Running up to {workers} scrapers in parallel\n")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_scraper, platform_name, scraper_cls, scraper_kwargs, incremental, resume): platform_name
+                for platform_name, scraper_cls, scraper_kwargs in scrapers
+            }
+            completed = {}
+            for future in as_completed(futures):
+                platform_name = futures[future]
+                try:
+                    completed[platform_name] = future.result()
+                except Exception as e:
+                    print(f"\n❌ Worker for {platform_name} crashed: {str(e)}")
+                    completed[platform_name] = {
+                        'status': 'failed',
+                        'error': str(e)
+                    }
+        
+        for platform_name, _, _ in scrapers:
+            results[platform_name] = completed[platform_name]
+        
+        return results
+    
+    # Platforms are different hosts, so no pause between them: each
+    # scraper's rate limiter paces its own requests
+    for platform_name, scraper_cls, scraper_kwargs in scrapers:
+        results[platform_name] = run_scraper(platform_name, scraper_cls, scraper_kwargs, incremental, resume)
+    
+    return results
+
+
+def run_all_scrapers(include_realt=False, include_propbase=False, workers=1, incremental=False, resume=False):
     """Run all platform scrapers"""
     
     print("\n" + "="*80)
@@ -27,56 +106,26 @@ def run_all_scrapers(include_realt=False, include_propbase=False):
     
     scrapers = []
     
-    scrapers.append(('Lofty.ai', LoftyScraper()))
-    scrapers.append(('Reental.co', ReentalScraper()))
-    scrapers.append(('Fraxtor', FraxtorScraper()))
-    scrapers.append(('Binaryx', BinaryxScraper()))
-    scrapers.append(('Mogul.club', MogulScraper()))
+    scrapers.append(('Lofty.ai', LoftyScraper, {}))
+    scrapers.append(('Reental.co', ReentalScraper, {}))
+    scrapers.append(('Fraxtor', FraxtorScraper, {}))
+    scrapers.append(('Binaryx', BinaryxScraper, {}))
+    scrapers.append(('Mogul.club', MogulScraper, {}))
     
     if include_realt:
-        scrapers.append(('RealT', RealTScraper(use_proxy=False)))
+        scrapers.append(('RealT', RealTScraper, {'use_proxy': False}))
     else:
         print("⏭️  Skipping RealT (blocks US IPs - set include_realt=True and configure proxy to enable)")
     
     if include_propbase:
-        scrapers.append(('Propbase.app', PropbaseScraper()))
+        scrapers.append(('Propbase.app', PropbaseScraper, {}))
     else:
         print("⏭️  Skipping Propbase (requires login - set include_propbase=True and configure credentials to enable)")
     
     print(f"\n📊 Running {len(scrapers)} scrapers...")
     print("-"*80 + "\n")
     
-    results = {}
-    
-    for platform_name, scraper in scrapers:
-        try:
-            print(f"\n{'='*80}")
-            print(f"🏢 {platform_name}")
-            print(f"{'='*80}\n")
-            
-            start_time = time.time()
-            scraper.run(full_scrape=True)
-            elapsed_time = time.time() - start_time
-            
-            results[platform_name] = {
-                'status': 'success',
-                'properties_count': len(scraper.properties),
-                'elapsed_time': f"{elapsed_time:.2f}s"
-            }
-            
-            print(f"\n✅ {platform_name} completed in {elapsed_time:.2f}s")
-            print(f"   Found {len(scraper.properties)} properties")
-            
-        except Exception as e:
-            print(f"\n❌ Error scraping {platform_name}: {str(e)}")
-            results[platform_name] = {
-                'status': 'failed',
-                'error': str(e)
-            }
-        
-        if scraper != scrapers[-1][1]:
-            print("\n⏸️  Pausing 5 seconds before next platform...")
-            time.sleep(5)
+    results = run_scrapers(scrapers, workers=workers, incremental=incremental, resume=resume)
     
     print("\n\n" + "="*80)
     print("SCRAPING SUMMARY")
@@ -94,6 +143,11 @@ def run_all_scrapers(include_realt=False, include_propbase=False):
             successful += 1
             print(f"   Properties: {result['properties_count']}")
             print(f"   Time: {result['elapsed_time']}")
+            slowest = sorted(result['phases'].items(), key=lambda item: item[1]['total'], reverse=True)[:3]
+            if slowest:
+                print("   Slowest phases: " + ", ".join(
+                    f"{phase} {stats['total']:.1f}s (p95 {stats['p95']:.2f}s)" for phase, stats in slowest
+                ))
             total_properties += result['properties_count']
         else:
             failed += 1
@@ -110,26 +164,29 @@ def run_all_scrapers(include_realt=False, include_propbase=False):
     return results
 
 
-def run_scrapers_for_platform(platform_names):
+def run_scrapers_for_platform(platform_names, workers=1, incremental=False, resume=False):
     """Run scrapers for specific platforms only"""
     platform_map = {
-        'lofty': LoftyScraper(),
-        'reental': ReentalScraper(),
-        'fraxtor': FraxtorScraper(),
-        'binaryx': BinaryxScraper(),
-        'mogul': MogulScraper(),
-        'realt': RealTScraper(use_proxy=False),
-        'propbase': PropbaseScraper()
+        'lofty': ('Lofty.ai', LoftyScraper, {}),
+        'lofty_api': ('Lofty.ai', LoftyApiScraper, {}),
+        'reental': ('Reental.co', ReentalScraper, {}),
+        'fraxtor': ('Fraxtor', FraxtorScraper, {}),
+        'binaryx': ('Binaryx', BinaryxScraper, {}),
+        'mogul': ('Mogul.club', MogulScraper, {}),
+        'realt': ('RealT', RealTScraper, {'use_proxy': False}),
+        'propbase': ('Propbase.app', PropbaseScraper, {})
     }
     
+    scrapers = []
     for platform_name in platform_names:
         platform_key = platform_name.lower()
         if platform_key in platform_map:
-            scraper = platform_map[platform_key]
-            print(f"\n🏢 Running {platform_name} scraper...")
-            scraper.run(full_scrape=True)
+            print(f"\n🏢 Queued {platform_name} scraper...")
+            scrapers.append(platform_map[platform_key])
         else:
             print(f"❌ Unknown platform: {platform_name}")
+    
+    return run_scrapers(scrapers, workers=workers, incremental=incremental, resume=resume)
 
 
 if __name__ == "__main__":
@@ -139,13 +196,19 @@ if __name__ == "__main__":
     parser.add_argument('--include-realt', action='store_true', help='Include RealT (requires proxy for US users)')
     parser.add_argument('--include-propbase', action='store_true', help='Include Propbase (requires login credentials)')
     parser.add_argument('--platforms', nargs='+', help='Run specific platforms only (e.g., lofty reental)')
+    parser.add_argument('--incremental', action='store_true', help='Only scrape details for new or changed listings')
+    parser.add_argument('--resume', action='store_true', help='Continue interrupted runs from their checkpoints')
+    parser.add_argument('--workers', type=int, default=1, help='Number of platforms to scrape in parallel (default: 1, sequential)')
     
     args = parser.parse_args()
     
     if args.platforms:
-        run_scrapers_for_platform(args.platforms)
+        run_scrapers_for_platform(args.platforms, workers=args.workers, incremental=args.incremental, resume=args.resume)
     else:
         run_all_scrapers(
             include_realt=args.include_realt,
-            include_propbase=args.include_propbase
+            include_propbase=args.include_propbase,
+            workers=args.workers,
+            incremental=args.incremental,
+            resume=args.resume
         )
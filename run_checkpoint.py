@@ -0,0 +1,69 @@
+"""
+Checkpoints for interrupted scrape runs
+data/<platform>/checkpoint.jsonl holds a header line (discovered URLs,
+marketplace card summaries, the in-progress snapshot) followed by one line
+per finished URL, so `--resume` can skip the marketplace and every detail
+page that already made it into the snapshot
+"""
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class RunCheckpoint:
+    """Append-only progress file for one platform's current run"""
+    
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, 'checkpoint.jsonl')
+        self._lock = threading.Lock()
+    
+    def start(self, property_urls: List[str], snapshot_path: str, listing_summaries: Dict[str, str], discovery_truncated: bool = False):
+        """Begin a new run, discarding any unfinished one"""
+        stale = self.load()
+        if stale and os.path.exists(f"{stale['snapshot']}.part"):
+            os.remove(f"{stale['snapshot']}.part")
+        
+        header = {
+            'started_at': datetime.now().isoformat(),
+            'snapshot': snapshot_path,
+            'property_urls': property_urls,
+            'listing_summaries': listing_summaries,
+            'discovery_truncated': discovery_truncated
+        }
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, ensure_ascii=False) + '\n')
+    
+    def mark_done(self, property_url: str):
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'done': property_url}) + '\n')
+    
+    def load(self) -> Optional[Dict]:
+        """The unfinished run, with a 'done' set of finished URLs, or None"""
+        if not os.path.exists(self.path):
+            return None
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        
+        try:
+            checkpoint = json.loads(lines[0])
+        except (IndexError, ValueError):
+            return None
+        
+        checkpoint['done'] = set()
+        for line in lines[1:]:
+            try:
+                checkpoint['done'].add(json.loads(line)['done'])
+            except (ValueError, KeyError):
+                continue  # Torn final line from the interrupted run
+        
+        return checkpoint
+    
+    def clear(self):
+        """Forget the run once it has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
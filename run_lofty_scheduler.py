@@ -11,6 +11,12 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.lofty_scraper_enhanced import LoftyScraperEnhanced
+from scrapers.lofty_api_scraper import LoftyApiScraper
+from browser_session import BrowserSession
+
+
+# Chrome stays up between cycles instead of cold-starting every run
+BROWSER_SESSION = BrowserSession()
 
 
 def run_lofty_scraper():
@@ -21,8 +27,12 @@ def run_lofty_scraper():
     print("="*80 + "\n")
     
     try:
-        scraper = LoftyScraperEnhanced()
-        scraper.run(full_scrape=True)
+        if os.getenv('LOFTY_BACKEND', 'browser') == 'api':
+            scraper = LoftyApiScraper()
+        else:
+            scraper = LoftyScraperEnhanced()
+        scraper.browser_session = BROWSER_SESSION
+        scraper.run(full_scrape=True, incremental=INCREMENTAL)
         
         print("\n✅ Lofty scraper completed successfully!")
         print(f"Next run scheduled in {INTERVAL_HOURS} hours")
@@ -57,6 +67,7 @@ def main():
 
 if __name__ == "__main__":
     INTERVAL_HOURS = int(os.getenv('SCRAPER_INTERVAL_HOURS', '3'))  # Default: 3 hours
+    INCREMENTAL = os.getenv('SCRAPER_INCREMENTAL', 'true').lower() == 'true'
     
     try:
         main()
@@ -64,4 +75,5 @@ if __name__ == "__main__":
         print("\n\n" + "="*80)
         print("🛑 Scheduler stopped by user")
         print("="*80 + "\n")
+        BROWSER_SESSION.close()
         sys.exit(0)
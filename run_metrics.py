@@ -0,0 +1,85 @@
+"""
+Per-run timing metrics for the scrapers
+BaseScraper wraps each phase (driver startup, marketplace discovery, detail
+pages, downloads, snapshot writes) in a span; at the end of a run the
+samples are summarised per phase (count, total, p50, p95, max) and written
+to data/<platform>/metrics.json, replacing the previous run's report
+"""
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted sample list"""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+class RunMetrics:
+    """Thread-safe duration samples grouped by phase name"""
+    
+    def __init__(self, platform: str):
+        self.platform = platform
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Drop the samples of a previous run (scrapers can be reused across scheduler cycles)"""
+        with self._lock:
+            self.samples = {}
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+    
+    def record(self, phase: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(phase, []).append(seconds)
+    
+    @contextmanager
+    def span(self, phase: str):
+        """Time the block as one sample of the phase, whether or not it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+    
+    def summary(self) -> Dict[str, Dict]:
+        """count, total, p50, p95 and max seconds per phase"""
+        with self._lock:
+            phases = {phase: sorted(samples) for phase, samples in self.samples.items()}
+        
+        return {
+            phase: {
+                'count': len(samples),
+                'total': round(sum(samples), 3),
+                'p50': round(percentile(samples, 50), 3),
+                'p95': round(percentile(samples, 95), 3),
+                'max': round(samples[-1], 3)
+            }
+            for phase, samples in phases.items()
+        }
+    
+    def save(self, output_dir: str, extra: Optional[Dict] = None) -> str:
+        """Write the run's metrics JSON over the previous one and return its path"""
+        report = {
+            'platform': self.platform,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed': round(time.perf_counter() - self._started, 3),
+            'phases': self.summary()
+        }
+        report.update(extra or {})
+        
+        path = os.path.join(output_dir, 'metrics.json')
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+        return path
@@ -8,36 +8,40 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import time
 from typing import List, Dict
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from base_scraper import BaseScraper
 
 
 class BinaryxScraper(BaseScraper):
     """Scraper for Binaryx platform"""
     
+    static_mode = True
+    static_required_fields = ('title', 'return')
+    listing_selector = "a[href*='/property'], a[href*='/listing'], a[href*='/project']"
+    
     def __init__(self):
         super().__init__(
             platform_name="binaryx",
-            base_url="https://www.binaryx.com"
+            base_url="https://www.binaryx.com",
+            allowed_hosts=["binaryx.com"]
         )
     
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
-        self.driver.get(self.base_url)
-        time.sleep(3)
+        self.load_page(self.base_url, self.listing_selector)
         
         property_urls = []
         
         try:
-            for _ in range(5):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+            self.scroll_listings()
             
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property'], a[href*='/listing'], a[href*='/project']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls and self.base_url in url:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -46,8 +50,7 @@ class BinaryxScraper(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape detailed information for a single property"""
-        self.driver.get(property_url)
-        time.sleep(3)
+        self.load_page(property_url)
         
         property_data = {
             'platform': 'Binaryx',
@@ -60,6 +63,8 @@ class BinaryxScraper(BaseScraper):
             try:
                 title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
                 property_data['title'] = title
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -69,6 +74,8 @@ class BinaryxScraper(BaseScraper):
                     parent = element.find_element(By.XPATH, "./..")
                     property_data['location'] = parent.text
                     break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -79,6 +86,8 @@ class BinaryxScraper(BaseScraper):
                     if '$' in text:
                         property_data['price'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -89,12 +98,16 @@ class BinaryxScraper(BaseScraper):
                     if '%' in text:
                         property_data['return'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
             try:
                 body_text = self.driver.find_element(By.TAG_NAME, "body").text
                 property_data['full_description'] = body_text[:1000]
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -102,6 +115,8 @@ class BinaryxScraper(BaseScraper):
                 images = self.driver.find_elements(By.CSS_SELECTOR, "img")
                 image_urls = [img.get_attribute('src') for img in images[:5] if img.get_attribute('src') and 'http' in img.get_attribute('src')]
                 property_data['images'] = image_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -113,14 +128,17 @@ class BinaryxScraper(BaseScraper):
                     if href:
                         document_urls.append(href)
                         try:
-                            filename = f"{property_data['property_id']}_{len(document_urls)}.pdf"
-                            self.download_file(href, filename)
+                            self.download_file(href, property_data['property_id'])
                         except:
                             pass
                 property_data['documents'] = document_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error scraping property details: {str(e)}")
         
@@ -129,4 +147,4 @@ class BinaryxScraper(BaseScraper):
 
 if __name__ == "__main__":
     scraper = BinaryxScraper()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -0,0 +1,340 @@
+"""
+API-backed scraper for Lofty.ai - reads the marketplace/property JSON the Lofty frontend loads
+instead of rendering every property page in Chrome
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import json
+import time
+from urllib.parse import urlparse
+from typing import List, Dict, Optional, Any
+from selenium.webdriver.common.by import By
+from scrapers.lofty_scraper_enhanced import LoftyScraperEnhanced
+
+
+# Endpoints of the Lofty web app's API. Not yet confirmed against a capture:
+# run this script with --discover to record what the frontend really loads,
+# then set these to the endpoints it reports
+LOFTY_API_URL = os.getenv('LOFTY_API_URL', 'https://api.lofty.ai/prod')
+MARKETPLACE_ENDPOINT = os.getenv('LOFTY_MARKETPLACE_ENDPOINT', '/properties/v2/marketplace')
+PROPERTY_ENDPOINT = os.getenv('LOFTY_PROPERTY_ENDPOINT', '/properties/v2/{property_id}')
+
+# Injected before the web app's own scripts: keeps a copy of every JSON
+# response fetched through fetch() or XMLHttpRequest in window.__apiResponses
+RECORD_SCRIPT = """
+(function () {
+    window.__apiResponses = [];
+    function keep(url, status, type, body) {
+        if (!type || type.indexOf('json') === -1) return;
+        try { window.__apiResponses.push({url: url, status: status, body: JSON.parse(body)}); } catch (e) {}
+    }
+    var fetch_ = window.fetch;
+    window.fetch = function (request) {
+        var url = typeof request === 'string' ? request : (request && request.url) || String(request);
+        return fetch_.apply(this, arguments).then(function (response) {
+            response.clone().text().then(function (body) {
+                keep(response.url || url, response.status, response.headers.get('content-type'), body);
+            }, function () {});
+            return response;
+        });
+    };
+    var open_ = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function () {
+        this.addEventListener('load', function () {
+            try { keep(this.responseURL, this.status, this.getResponseHeader('content-type'), this.responseText); } catch (e) {}
+        });
+        return open_.apply(this, arguments);
+    };
+})();
+"""
+
+
+class LoftyApiScraper(LoftyScraperEnhanced):
+    """Lofty.ai scraper backed by structured JSON endpoints - fills the same fields as LoftyScraperEnhanced
+    
+    Set LOFTY_API_CAPTURE=<dir> to save every response as a JSON fixture, and
+    LOFTY_API_FIXTURES=<dir> to replay captured fixtures instead of the live API.
+    discover() records the JSON the Lofty frontend loads, to find the
+    endpoints and key names in the first place.
+    """
+    
+    requires_browser = False
+    
+    # property_data key -> JSON keys (snake_case, camelCase) of the same name.
+    # Only add other spellings once a capture shows the API uses them
+    FIELD_KEYS = {
+        'address': ('address',),
+        'city_state': ('city_state', 'cityState'),
+        'city': ('city',),
+        'state': ('state',),
+        'zipcode': ('zipcode',),
+        'estimated_price': ('estimated_price', 'estimatedPrice'),
+        'projected_annual_return': ('projected_annual_return', 'projectedAnnualReturn'),
+        'rental_yield': ('rental_yield', 'rentalYield'),
+        'bedrooms': ('bedrooms',),
+        'bathrooms': ('bathrooms',),
+        'square_feet': ('square_feet', 'squareFeet'),
+        'property_type': ('property_type', 'propertyType'),
+        'year_built': ('year_built', 'yearBuilt'),
+        'monthly_rent': ('monthly_rent', 'monthlyRent'),
+        'lease_term': ('lease_term', 'leaseTerm'),
+        'security_deposit': ('security_deposit', 'securityDeposit'),
+        'loan_amount': ('loan_amount', 'loanAmount'),
+        'mortgage_rate': ('mortgage_rate', 'mortgageRate'),
+        'niche_rating': ('niche_rating', 'nicheRating'),
+        'description': ('description',),
+    }
+    
+    MONEY_FIELDS = {'estimated_price', 'monthly_rent', 'security_deposit', 'loan_amount'}
+    PERCENT_FIELDS = {'projected_annual_return', 'rental_yield', 'mortgage_rate'}
+    
+    # JSON keys holding fractions (0.053 -> 5.3%) rather than percentages.
+    # None is confirmed yet, so percent values are stored as the API sends them
+    RATIO_KEYS = frozenset()
+    
+    def __init__(self):
+        super().__init__()
+        self.api_url = LOFTY_API_URL.rstrip('/')
+        self.fixtures_dir = os.getenv('LOFTY_API_FIXTURES')
+        self.capture_dir = os.getenv('LOFTY_API_CAPTURE')
+        self._listings = {}
+        
+        if self.capture_dir:
+            os.makedirs(self.capture_dir, exist_ok=True)
+    
+    def _get_json(self, name: str, path: str, params: Optional[Dict] = None) -> Any:
+        """GET a JSON endpoint, or read its captured fixture when replaying"""
+        if self.fixtures_dir:
+            fixture_path = os.path.join(self.fixtures_dir, f"{name}.json")
+            if not os.path.exists(fixture_path):
+                return None
+            with open(fixture_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        url = f"{self.api_url}{path}"
+        with self.rate_limiter.throttle(url):
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+        payload = response.json()
+        
+        if self.capture_dir:
+            with open(os.path.join(self.capture_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+        
+        return payload
+    
+    @staticmethod
+    def _unwrap_list(payload: Any) -> List[Dict]:
+        """Pull the list of records out of a response envelope"""
+        if isinstance(payload, list):
+            return payload
+        if isinstance(payload, dict):
+            for key in ('data', 'properties', 'items', 'results'):
+                value = payload.get(key)
+                if isinstance(value, list):
+                    return value
+                if isinstance(value, dict):
+                    return LoftyApiScraper._unwrap_list(value)
+        return []
+    
+    @staticmethod
+    def _unwrap_record(payload: Any) -> Dict:
+        """Pull a single record out of a response envelope"""
+        if isinstance(payload, dict):
+            for key in ('data', 'property'):
+                if isinstance(payload.get(key), dict):
+                    return payload[key]
+            return payload
+        return {}
+    
+    def _listing_url(self, listing: Dict) -> Optional[str]:
+        """property_deal URL of a listing, as the marketplace page links it
+        
+        Property IDs are then taken from the URL exactly as the browser
+        scrapers do, so both backends write the same IDs to data/lofty.
+        """
+        value = listing.get('url')
+        if isinstance(value, str) and '/property_deal/' in value:
+            return value if value.startswith('http') else f"{self.base_url}{value}"
+        if listing.get('slug'):
+            return f"{self.base_url}/property_deal/{listing['slug']}"
+        return None
+    
+    def scrape_marketplace(self) -> List[str]:
+        """Page through the marketplace endpoint and return property URLs"""
+        property_urls = []
+        page = 1
+        
+        try:
+            while True:
+                payload = self._get_json(f"marketplace_page_{page}", MARKETPLACE_ENDPOINT, params={'page': page})
+                listings = self._unwrap_list(payload)
+                if not listings:
+                    break
+                
+                added = 0
+                for listing in listings:
+                    url = self._listing_url(listing)
+                    if not url or self.property_id_from_url(url) in self._listings:
+                        continue
+                    self._listings[self.property_id_from_url(url)] = listing
+                    property_urls.append(url)
+                    self.listing_summaries[url] = json.dumps(listing, sort_keys=True, ensure_ascii=False)
+                    added += 1
+                
+                # Unpaginated endpoints return the same list for every page
+                if added == 0:
+                    break
+                page += 1
+        
+        except Exception as e:
+            print(f"Error scraping marketplace API: {str(e)}")
+        
+        return property_urls
+    
+    def resume_marketplace(self):
+        """Rebuild the listing records saved as card summaries in the checkpoint"""
+        for url, summary in self.listing_summaries.items():
+            try:
+                self._listings[self.property_id_from_url(url)] = json.loads(summary)
+            except (TypeError, ValueError):
+                continue
+    
+    def _format_value(self, field: str, key: str, value: Any) -> str:
+        """Format typed API values the same way the DOM scraper stores them"""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if field in self.MONEY_FIELDS:
+                return f"${value:,.2f}" if value % 1 else f"${value:,.0f}"
+            if field in self.PERCENT_FIELDS:
+                percent = value * 100 if key in self.RATIO_KEYS else value
+                return f"{round(percent, 2):g}%"
+        return str(value)
+    
+    def scrape_property_details(self, property_url: str) -> Dict:
+        """Build a property record from the listing and property JSON"""
+        property_id = self.property_id_from_url(property_url)
+        
+        property_data = {
+            'platform': 'Lofty.ai',
+            'url': property_url,
+            'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'property_id': property_id
+        }
+        
+        record = dict(self._listings.get(property_id, {}))
+        try:
+            # The endpoint takes the API's own id, which can differ from the URL slug
+            api_id = record.get('id') or property_id
+            detail = self._get_json(f"property_{property_id}", PROPERTY_ENDPOINT.format(property_id=api_id))
+            record.update(self._unwrap_record(detail))
+        except Exception as e:
+            print(f"Error fetching property API for {property_id}: {str(e)}")
+        
+        if not record:
+            return property_data
+        
+        for field, keys in self.FIELD_KEYS.items():
+            for key in keys:
+                value = record.get(key)
+                if value not in (None, ''):
+                    property_data[field] = self._format_value(field, key, value)
+                    break
+        
+        if 'address' in property_data:
+            property_data['title'] = property_data['address']
+        if 'city_state' not in property_data and property_data.get('city'):
+            property_data['city_state'] = ', '.join(
+                part for part in (property_data.get('city'), property_data.get('state'), property_data.get('zipcode')) if part
+            )
+        for key in ('city', 'state', 'zipcode'):
+            property_data.pop(key, None)
+        
+        images = record.get('images') or []
+        image_urls = []
+        for image in images[:10]:
+            src = image.get('url') if isinstance(image, dict) else image
+            if src and src not in image_urls:
+                image_urls.append(src)
+        property_data['images'] = image_urls
+        
+        documents = {}
+        document_urls = []
+        for doc in record.get('documents') or []:
+            if isinstance(doc, dict):
+                href = doc.get('url')
+                text = (doc.get('name') or '').strip()
+            else:
+                href, text = doc, ''
+            if href:
+                self.record_document(property_id, documents, document_urls, href, text)
+        property_data['documents'] = documents
+        property_data['document_count'] = len(document_urls)
+        
+        description = property_data.pop('description', None)
+        if description:
+            property_data['full_description'] = description[:2000]
+        
+        return property_data
+    
+    def discover(self, capture_dir: str, properties: int = 1) -> List[Dict]:
+        """Record the JSON responses the Lofty web app loads
+        
+        Opens the marketplace and the first few property pages in Chrome with
+        RECORD_SCRIPT injected, writes each JSON response to capture_dir as
+        {url, status, body} and returns (and saves as endpoints.json) an
+        index of the URLs with each body's top-level keys.
+        """
+        os.makedirs(capture_dir, exist_ok=True)
+        responses = []
+        
+        self.setup_driver(headless=True)
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': RECORD_SCRIPT})
+            
+            self.load_page(self.marketplace_url, self.listing_selector)
+            self.scroll_listings()
+            links = [element.get_attribute('href') for element in self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)]
+            responses.extend(self.driver.execute_script("return window.__apiResponses || [];"))
+            
+            for url in list(dict.fromkeys(link for link in links if link))[:properties]:
+                self.load_page(url)
+                responses.extend(self.driver.execute_script("return window.__apiResponses || [];"))
+        finally:
+            self.close_driver()
+        
+        index = []
+        for n, response in enumerate(responses, 1):
+            slug = re.sub(r'[^A-Za-z0-9]+', '_', urlparse(response['url']).path).strip('_')[:60]
+            name = f"{n:02d}_{slug or 'root'}.json"
+            with open(os.path.join(capture_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(response, f, indent=2, ensure_ascii=False)
+            
+            body = response['body']
+            if isinstance(body, dict):
+                keys = sorted(body)
+            elif isinstance(body, list):
+                keys = sorted(body[0]) if body and isinstance(body[0], dict) else []
+            else:
+                keys = []
+            index.append({'file': name, 'url': response['url'], 'status': response['status'], 'keys': keys})
+        
+        with open(os.path.join(capture_dir, 'endpoints.json'), 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        
+        return index
+
+
+if __name__ == "__main__":
+    scraper = LoftyApiScraper()
+    if '--discover' in sys.argv:
+        position = sys.argv.index('--discover') + 1
+        capture_dir = sys.argv[position] if position < len(sys.argv) else 'lofty_api_discovery'
+        for entry in scraper.discover(capture_dir):
+            print(f"{entry['status']} {entry['url']} -> {', '.join(entry['keys'][:20])}")
+        print(f"Responses saved to {capture_dir}")
+        scraper.downloader.close()
+    else:
+        scraper.run(full_scrape=True, resume='--resume' in sys.argv)
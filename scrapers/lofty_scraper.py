@@ -9,46 +9,51 @@ import time
 import re
 from typing import List, Dict
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from base_scraper import BaseScraper
+from extraction_rules import TextRules
 
 
 class LoftyScraper(BaseScraper):
     """Scraper for Lofty.ai platform"""
     
+    listing_selector = "a[href*='/property_deal/']"
+    
+    # Detail pages are ready once the metric cards have rendered
+    detail_ready_selector = "[class*='metric'], [class*='stat'], [class*='value']"
+    
+    TEXT_RULES = TextRules([
+        ('token_price', r'\$(\d+(?:\.\d{2})?)\s*(?:per token|/token)', re.IGNORECASE, '${1}'),
+        ('total_tokens', r'(\d+(?:,\d{3})*)\s*tokens?', re.IGNORECASE, '{1}'),
+        ('rental_yield', r'(\d+(?:\.\d+)?%)\s*(?:yield|return|APY)', re.IGNORECASE, '{1}'),
+    ])
+    
     def __init__(self):
         super().__init__(
             platform_name="lofty",
-            base_url="https://www.lofty.ai"
+            base_url="https://www.lofty.ai",
+            allowed_hosts=["lofty.ai"]
         )
         self.marketplace_url = f"{self.base_url}/marketplace"
     
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
-        self.driver.get(self.marketplace_url)
-        time.sleep(3)  # Wait for page to load
+        self.load_page(self.marketplace_url, self.listing_selector)
         
         property_urls = []
         
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            self.scroll_listings()
             
-            while True:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-            
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property_deal/']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -57,8 +62,7 @@ class LoftyScraper(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape detailed information for a single property"""
-        self.driver.get(property_url)
-        time.sleep(3)
+        self.load_page(property_url)
         
         property_data = {
             'platform': 'Lofty.ai',
@@ -72,6 +76,8 @@ class LoftyScraper(BaseScraper):
                 title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
                 property_data['title'] = title
                 property_data['address'] = title  # Address is usually in the title
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -89,6 +95,8 @@ class LoftyScraper(BaseScraper):
                         property_data['annual_return'] = text
                     elif 'Token' in text:
                         property_data['token_info'] = text
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -105,6 +113,8 @@ class LoftyScraper(BaseScraper):
                         property_data['square_feet'] = text
                     elif 'Year Built' in text or 'year built' in text:
                         property_data['year_built'] = text
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -114,6 +124,8 @@ class LoftyScraper(BaseScraper):
                     parent = element.find_element(By.XPATH, "./..")
                     property_data['rental_income'] = parent.text
                     break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -125,6 +137,8 @@ class LoftyScraper(BaseScraper):
                     if src and 'http' in src:
                         image_urls.append(src)
                 property_data['images'] = image_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -132,7 +146,9 @@ class LoftyScraper(BaseScraper):
                 try:
                     docs_tab = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Documents') or contains(text(), 'documents')]")
                     docs_tab.click()
-                    time.sleep(2)
+                    self.wait_for_selector("a[href$='.pdf'], a[href*='/asset.lofty.ai/']", timeout=2)
+                except StaleElementReferenceException:
+                    raise
                 except:
                     pass
                 
@@ -145,32 +161,27 @@ class LoftyScraper(BaseScraper):
                         document_urls.append(href)
                         
                         try:
-                            filename = f"{property_data['property_id']}_{len(document_urls)}.pdf"
-                            self.download_file(href, filename)
+                            self.download_file(href, property_data['property_id'])
                         except:
                             pass
                 
                 property_data['documents'] = document_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
             try:
                 page_text = self.driver.find_element(By.TAG_NAME, "body").text
-                
-                token_match = re.search(r'\$(\d+(?:\.\d{2})?)\s*(?:per token|/token)', page_text, re.IGNORECASE)
-                if token_match:
-                    property_data['token_price'] = f"${token_match.group(1)}"
-                
-                tokens_match = re.search(r'(\d+(?:,\d{3})*)\s*tokens?', page_text, re.IGNORECASE)
-                if tokens_match:
-                    property_data['total_tokens'] = tokens_match.group(1)
-                
-                yield_match = re.search(r'(\d+(?:\.\d+)?%)\s*(?:yield|return|APY)', page_text, re.IGNORECASE)
-                if yield_match:
-                    property_data['rental_yield'] = yield_match.group(1)
+                with self.metrics.span('text_rules'):
+                    property_data.update(self.TEXT_RULES.extract(page_text))
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error scraping property details: {str(e)}")
         
@@ -179,4 +190,4 @@ class LoftyScraper(BaseScraper):
 
 if __name__ == "__main__":
     scraper = LoftyScraper()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -9,44 +9,79 @@ import time
 import re
 from typing import List, Dict
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from base_scraper import BaseScraper
+from extraction_rules import TextRules, KeywordClassifier
 
 
 class LoftyScraperEnhanced(BaseScraper):
     """Enhanced scraper for Lofty.ai platform - captures comprehensive property data"""
     
+    listing_selector = "a[href*='/property_deal/']"
+    
+    # TEXT_RULES read these figures from the page text, which renders after
+    # the h1; give them a moment, but a listing without one is still scraped
+    detail_data_selector = "//body[.//*[contains(text(), 'Estimated Price')] and .//*[contains(text(), 'Projected Annual Return')]]"
+    
+    # (field, pattern, flags, template): {0} is the whole match, {1} the first group
+    TEXT_RULES = TextRules([
+        ('estimated_price', r'Estimated Price[^\$]*\$([0-9,]+\.?\d*)', re.IGNORECASE, '${1}'),
+        ('projected_annual_return', r'Projected Annual Return[^\d]*([\d.]+)%', re.IGNORECASE, '{1}%'),
+        ('rental_yield', r'Rental Yield[^\d]*([\d.]+)%', re.IGNORECASE, '{1}%'),
+        ('bedrooms', r'(\d+)\s*Bed', 0, '{1}'),
+        ('bathrooms', r'(\d+)\s*Bath', 0, '{1}'),
+        ('square_feet', r'(\d+)\s*sqft', 0, '{1}'),
+        ('property_type', r'(Single family|Multi-family|Condo|Townhouse)', re.IGNORECASE, '{1}'),
+        ('year_built', r'Built in (\d{4})', 0, '{1}'),
+        ('monthly_rent', r'\$([0-9,]+)/month', 0, '${1}'),
+        ('lease_term', r'(\d+)\s*(?:year|month)\s*lease', re.IGNORECASE, '{0}'),
+        ('security_deposit', r'\$([0-9,]+)\s*Security Deposit', 0, '${1}'),
+        ('loan_amount', r'loan of \$([0-9,]+\.?\d*)', re.IGNORECASE, '${1}'),
+        ('mortgage_rate', r'(\d+\.\d+)%\s*mortgage', re.IGNORECASE, '{1}%'),
+        ('niche_rating', r'"([A-F])".*Rating.*Zip Code', 0, '{1}'),
+    ])
+    
+    # First match in table order wins, as in the old if/elif chain
+    DOCUMENT_TYPES = KeywordClassifier([
+        ('appraisal', 'appraisal', 'both'),
+        ('inspection', 'inspection', 'text'),
+        ('lease', 'lease', 'text'),
+        ('insurance', 'insurance', 'text'),
+        ('loan', 'loan_documents', 'text'),
+        ('mortgage', 'loan_documents', 'text'),
+        ('management', 'property_management', 'text'),
+        ('operating agreement', 'operating_agreement', 'text'),
+        ('llc', 'llc_documents', 'text'),
+        ('title', 'title_documents', 'text'),
+        ('deed', 'title_documents', 'text'),
+        ('transaction', 'transaction_data', 'text'),
+        ('asset.lofty.ai', 'offering_document', 'href'),
+    ])
+    
     def __init__(self):
         super().__init__(
             platform_name="lofty",
-            base_url="https://www.lofty.ai"
+            base_url="https://www.lofty.ai",
+            allowed_hosts=["lofty.ai"]
         )
         self.marketplace_url = f"{self.base_url}/marketplace"
     
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
-        self.driver.get(self.marketplace_url)
-        time.sleep(3)
+        self.load_page(self.marketplace_url, self.listing_selector)
         
         property_urls = []
         
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            self.scroll_listings()
             
-            while True:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-            
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property_deal/']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -55,8 +90,7 @@ class LoftyScraperEnhanced(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape comprehensive property information"""
-        self.driver.get(property_url)
-        time.sleep(4)
+        self.load_page(property_url)
         
         property_data = {
             'platform': 'Lofty.ai',
@@ -72,112 +106,24 @@ class LoftyScraperEnhanced(BaseScraper):
                 title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
                 property_data['title'] = title
                 property_data['address'] = title
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
             try:
                 city_state = self.driver.find_element(By.CSS_SELECTOR, "h4").text
                 property_data['city_state'] = city_state
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
-            try:
-                price_match = re.search(r'Estimated Price[^\$]*\$([0-9,]+\.?\d*)', page_text, re.IGNORECASE)
-                if price_match:
-                    property_data['estimated_price'] = f"${price_match.group(1)}"
-            except:
-                pass
-            
-            try:
-                return_match = re.search(r'Projected Annual Return[^\d]*([\d.]+)%', page_text, re.IGNORECASE)
-                if return_match:
-                    property_data['projected_annual_return'] = f"{return_match.group(1)}%"
-            except:
-                pass
-            
-            try:
-                yield_match = re.search(r'Rental Yield[^\d]*([\d.]+)%', page_text, re.IGNORECASE)
-                if yield_match:
-                    property_data['rental_yield'] = f"{yield_match.group(1)}%"
-            except:
-                pass
-            
-            try:
-                beds_match = re.search(r'(\d+)\s*Bed', page_text)
-                if beds_match:
-                    property_data['bedrooms'] = beds_match.group(1)
-            except:
-                pass
+            with self.metrics.span('text_rules'):
+                property_data.update(self.TEXT_RULES.extract(page_text))
             
-            try:
-                baths_match = re.search(r'(\d+)\s*Bath', page_text)
-                if baths_match:
-                    property_data['bathrooms'] = baths_match.group(1)
-            except:
-                pass
-            
-            try:
-                sqft_match = re.search(r'(\d+)\s*sqft', page_text)
-                if sqft_match:
-                    property_data['square_feet'] = sqft_match.group(1)
-            except:
-                pass
-            
-            try:
-                type_match = re.search(r'(Single family|Multi-family|Condo|Townhouse)', page_text, re.IGNORECASE)
-                if type_match:
-                    property_data['property_type'] = type_match.group(1)
-            except:
-                pass
-            
-            try:
-                built_match = re.search(r'Built in (\d{4})', page_text)
-                if built_match:
-                    property_data['year_built'] = built_match.group(1)
-            except:
-                pass
-            
-            try:
-                rent_match = re.search(r'\$([0-9,]+)/month', page_text)
-                if rent_match:
-                    property_data['monthly_rent'] = f"${rent_match.group(1)}"
-            except:
-                pass
-            
-            try:
-                lease_match = re.search(r'(\d+)\s*(?:year|month)\s*lease', page_text, re.IGNORECASE)
-                if lease_match:
-                    property_data['lease_term'] = lease_match.group(0)
-            except:
-                pass
-            
-            try:
-                deposit_match = re.search(r'\$([0-9,]+)\s*Security Deposit', page_text)
-                if deposit_match:
-                    property_data['security_deposit'] = f"${deposit_match.group(1)}"
-            except:
-                pass
-            
-            try:
-                loan_match = re.search(r'loan of \$([0-9,]+\.?\d*)', page_text, re.IGNORECASE)
-                if loan_match:
-                    property_data['loan_amount'] = f"${loan_match.group(1)}"
-            except:
-                pass
-            
-            try:
-                rate_match = re.search(r'(\d+\.\d+)%\s*mortgage', page_text, re.IGNORECASE)
-                if rate_match:
-                    property_data['mortgage_rate'] = f"{rate_match.group(1)}%"
-            except:
-                pass
-            
-            try:
-                rating_match = re.search(r'"([A-F])".*Rating.*Zip Code', page_text)
-                if rating_match:
-                    property_data['niche_rating'] = rating_match.group(1)
-            except:
-                pass
+            if os.getenv('LOFTY_PAGE_CAPTURE'):
+                self.capture_page_text(property_data['property_id'], page_text)
             
             try:
                 images = self.driver.find_elements(By.CSS_SELECTOR, "img[src*='images.lofty.ai']")
@@ -187,6 +133,8 @@ class LoftyScraperEnhanced(BaseScraper):
                     if src and src not in image_urls:
                         image_urls.append(src)
                 property_data['images'] = image_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -201,64 +149,57 @@ class LoftyScraperEnhanced(BaseScraper):
                     text = link.text.strip()
                     
                     if href and ('dropbox.com' in href or 'asset.lofty.ai' in href):
-                        doc_type = 'unknown'
-                        
-                        if 'appraisal' in text.lower() or 'appraisal' in href.lower():
-                            doc_type = 'appraisal'
-                        elif 'inspection' in text.lower():
-                            doc_type = 'inspection'
-                        elif 'lease' in text.lower():
-                            doc_type = 'lease'
-                        elif 'insurance' in text.lower():
-                            doc_type = 'insurance'
-                        elif 'loan' in text.lower() or 'mortgage' in text.lower():
-                            doc_type = 'loan_documents'
-                        elif 'management' in text.lower():
-                            doc_type = 'property_management'
-                        elif 'operating agreement' in text.lower():
-                            doc_type = 'operating_agreement'
-                        elif 'llc' in text.lower():
-                            doc_type = 'llc_documents'
-                        elif 'title' in text.lower() or 'deed' in text.lower():
-                            doc_type = 'title_documents'
-                        elif 'transaction' in text.lower():
-                            doc_type = 'transaction_data'
-                        elif 'asset.lofty.ai' in href:
-                            doc_type = 'offering_document'
-                        
-                        if href not in document_urls:
-                            document_urls.append(href)
-                            
-                            if doc_type not in documents:
-                                documents[doc_type] = []
-                            documents[doc_type].append({
-                                'url': href,
-                                'label': text if text else doc_type
-                            })
-                            
-                            filename = f"{property_data['property_id']}_{doc_type}_{len(documents[doc_type])}"
-                            if href.endswith('.pdf') or 'asset.lofty.ai' in href:
-                                filename += '.pdf'
-                            
-                            try:
-                                self.download_file(href, filename)
-                            except:
-                                pass
+                        self.record_document(property_data['property_id'], documents, document_urls, href, text)
                 
                 property_data['documents'] = documents
                 property_data['document_count'] = len(document_urls)
                 
+            except StaleElementReferenceException:
+                raise
             except Exception as e:
                 print(f"Error extracting documents: {str(e)}")
             
             property_data['full_description'] = page_text[:2000]
             
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error scraping property details: {str(e)}")
         
         return property_data
+    
+    def classify_document(self, text: str, href: str) -> str:
+        """Work out a document's type from its link text and URL"""
+        return self.DOCUMENT_TYPES.classify(text, href)
+    
+    def capture_page_text(self, property_id: str, page_text: str):
+        """Save a page's text as a fixture for benchmarking the extraction rules"""
+        capture_dir = os.getenv('LOFTY_PAGE_CAPTURE')
+        os.makedirs(capture_dir, exist_ok=True)
+        with open(os.path.join(capture_dir, f"{property_id}.txt"), 'w', encoding='utf-8') as f:
+            f.write(page_text)
+    
+    def record_document(self, property_id: str, documents: Dict, document_urls: List[str], href: str, text: str):
+        """Classify a document link, add it to the property's documents and download it"""
+        if href in document_urls:
+            return
+        
+        doc_type = self.classify_document(text, href)
+        document_urls.append(href)
+        
+        if doc_type not in documents:
+            documents[doc_type] = []
+        documents[doc_type].append({
+            'url': href,
+            'label': text if text else doc_type
+        })
+        
+        try:
+            self.download_file(href, property_id, doc_type)
+        except:
+            pass
 
 
 if __name__ == "__main__":
     scraper = LoftyScraperEnhanced()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -5,39 +5,55 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import time
 from typing import List, Dict
 from selenium.webdriver.common.by import By
 from base_scraper import BaseScraper
+from field_spec import text_xpath
 
 
 class MogulScraper(BaseScraper):
     """Scraper for Mogul.club platform"""
     
+    static_mode = True
+    static_required_fields = ('title', 'return')
+    listing_selector = "a[href*='/property'], a[href*='/listing'], a[href*='/deal']"
+    
+    platform_label = "Mogul.club"
+    
+    field_spec = {
+        'title': {'css': 'h1'},
+        'location': {'xpath': text_xpath('Location', 'location', 'Address'), 'parent': True},
+        'price': {'xpath': text_xpath('$', 'Price', 'Value'), 'contains': '$'},
+        'return': {'xpath': text_xpath('%', 'ROI', 'Return'), 'contains': '%'},
+        'property_details': {'xpath': text_xpath('Bed', 'Bath', 'sqft'), 'all': True, 'limit': 5, 'join': ' | '},
+        'full_description': {'css': 'body', 'max_length': 1000},
+        'images': {'css': 'img', 'attr': 'src', 'scan': 5, 'contains': 'http', 'all': True},
+        'documents': {'css': "a[href$='.pdf']", 'attr': 'href', 'all': True}
+    }
+    
     def __init__(self):
         super().__init__(
             platform_name="mogul",
-            base_url="https://www.mogul.club"
+            base_url="https://www.mogul.club",
+            allowed_hosts=["mogul.club"]
         )
     
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
-        self.driver.get(self.base_url)
-        time.sleep(3)
+        self.load_page(self.base_url, self.listing_selector)
         
         property_urls = []
         
         try:
-            for _ in range(5):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+            self.scroll_listings()
             
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property'], a[href*='/listing'], a[href*='/deal']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls and self.base_url in url:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -46,96 +62,9 @@ class MogulScraper(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape detailed information for a single property"""
-        self.driver.get(property_url)
-        time.sleep(3)
-        
-        property_data = {
-            'platform': 'Mogul.club',
-            'url': property_url,
-            'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'property_id': property_url.split('/')[-1]
-        }
-        
-        try:
-            try:
-                title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
-                property_data['title'] = title
-            except:
-                pass
-            
-            try:
-                location_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Location') or contains(text(), 'location') or contains(text(), 'Address')]")
-                for element in location_elements:
-                    parent = element.find_element(By.XPATH, "./..")
-                    property_data['location'] = parent.text
-                    break
-            except:
-                pass
-            
-            try:
-                price_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), '$') or contains(text(), 'Price') or contains(text(), 'Value')]")
-                for element in price_elements:
-                    text = element.text
-                    if '$' in text:
-                        property_data['price'] = text
-                        break
-            except:
-                pass
-            
-            try:
-                metric_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), '%') or contains(text(), 'ROI') or contains(text(), 'Return')]")
-                for element in metric_elements:
-                    text = element.text
-                    if '%' in text:
-                        property_data['return'] = text
-                        break
-            except:
-                pass
-            
-            try:
-                detail_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Bed') or contains(text(), 'Bath') or contains(text(), 'sqft')]")
-                details = []
-                for element in detail_elements:
-                    details.append(element.text)
-                property_data['property_details'] = ' | '.join(details[:5])
-            except:
-                pass
-            
-            try:
-                body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                property_data['full_description'] = body_text[:1000]
-            except:
-                pass
-            
-            try:
-                images = self.driver.find_elements(By.CSS_SELECTOR, "img")
-                image_urls = [img.get_attribute('src') for img in images[:5] if img.get_attribute('src') and 'http' in img.get_attribute('src')]
-                property_data['images'] = image_urls
-            except:
-                pass
-            
-            try:
-                pdf_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href$='.pdf']")
-                document_urls = []
-                for link in pdf_links:
-                    href = link.get_attribute('href')
-                    if href:
-                        document_urls.append(href)
-                        try:
-                            filename = f"{property_data['property_id']}_{len(document_urls)}.pdf"
-                            self.download_file(href, filename)
-                        except:
-                            pass
-                property_data['documents'] = document_urls
-            except:
-                pass
-            
-        except Exception as e:
-            print(f"Error scraping property details: {str(e)}")
-        
-        return property_data
+        return self.scrape_with_field_spec(property_url)
 
 
 if __name__ == "__main__":
     scraper = MogulScraper()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import time
 from typing import List, Dict
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from dotenv import load_dotenv
 from base_scraper import BaseScraper
 
@@ -18,14 +19,18 @@ load_dotenv()
 class PropbaseScraper(BaseScraper):
     """Scraper for Propbase.app platform"""
     
+    listing_selector = "a[href*='/property'], a[href*='/listing']"
+    
     def __init__(self, email: str = None, password: str = None):
         super().__init__(
             platform_name="propbase",
-            base_url="https://www.propbase.app"
+            base_url="https://www.propbase.app",
+            allowed_hosts=["propbase.app"]
         )
         self.email = email or os.getenv('PROPBASE_EMAIL')
         self.password = password or os.getenv('PROPBASE_PASSWORD')
         self.logged_in = False
+        self.detail_workers = 1  # Login session only exists in the main driver
     
     def login(self):
         """Login to Propbase"""
@@ -35,8 +40,7 @@ class PropbaseScraper(BaseScraper):
             return False
         
         try:
-            self.driver.get(f"{self.base_url}/login")
-            time.sleep(3)
+            self.load_page(f"{self.base_url}/login", "input[type='password']")
             
             email_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='email'], input[name='email'], input[placeholder*='email' i]")
             email_input.send_keys(self.email)
@@ -47,7 +51,7 @@ class PropbaseScraper(BaseScraper):
             login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit'], button:contains('Login'), button:contains('Sign In')")
             login_button.click()
             
-            time.sleep(5)
+            self.wait_for(lambda d: "login" not in d.current_url.lower())
             
             if "login" not in self.driver.current_url.lower():
                 print("Login successful!")
@@ -61,6 +65,11 @@ class PropbaseScraper(BaseScraper):
             print(f"Error during login: {str(e)}")
             return False
     
+    def resume_marketplace(self):
+        """Detail pages need the login session that scrape_marketplace() opens"""
+        if not self.logged_in:
+            self.login()
+    
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
         if not self.logged_in:
@@ -68,22 +77,20 @@ class PropbaseScraper(BaseScraper):
                 print("Cannot scrape marketplace without login")
                 return []
         
-        self.driver.get(f"{self.base_url}/marketplace")
-        time.sleep(3)
+        self.load_page(f"{self.base_url}/marketplace", self.listing_selector)
         
         property_urls = []
         
         try:
-            for _ in range(5):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+            self.scroll_listings()
             
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property'], a[href*='/listing']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls and self.base_url in url:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -92,8 +99,7 @@ class PropbaseScraper(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape detailed information for a single property"""
-        self.driver.get(property_url)
-        time.sleep(3)
+        self.load_page(property_url)
         
         property_data = {
             'platform': 'Propbase.app',
@@ -106,6 +112,8 @@ class PropbaseScraper(BaseScraper):
             try:
                 title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
                 property_data['title'] = title
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -115,6 +123,8 @@ class PropbaseScraper(BaseScraper):
                     parent = element.find_element(By.XPATH, "./..")
                     property_data['location'] = parent.text
                     break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -125,6 +135,8 @@ class PropbaseScraper(BaseScraper):
                     if '$' in text:
                         property_data['price'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -135,12 +147,16 @@ class PropbaseScraper(BaseScraper):
                     if '%' in text:
                         property_data['return'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
             try:
                 body_text = self.driver.find_element(By.TAG_NAME, "body").text
                 property_data['full_description'] = body_text[:1000]
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -148,6 +164,8 @@ class PropbaseScraper(BaseScraper):
                 images = self.driver.find_elements(By.CSS_SELECTOR, "img")
                 image_urls = [img.get_attribute('src') for img in images[:5] if img.get_attribute('src') and 'http' in img.get_attribute('src')]
                 property_data['images'] = image_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -159,14 +177,17 @@ class PropbaseScraper(BaseScraper):
                     if href:
                         document_urls.append(href)
                         try:
-                            filename = f"{property_data['property_id']}_{len(document_urls)}.pdf"
-                            self.download_file(href, filename)
+                            self.download_file(href, property_data['property_id'])
                         except:
                             pass
                 property_data['documents'] = document_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error scraping property details: {str(e)}")
         
@@ -175,4 +196,4 @@ class PropbaseScraper(BaseScraper):
 
 if __name__ == "__main__":
     scraper = PropbaseScraper()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -9,42 +9,40 @@ import time
 import re
 from typing import List, Dict
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
 from base_scraper import BaseScraper
 
 
 class ReentalScraper(BaseScraper):
     """Scraper for Reental.co platform"""
     
+    static_mode = True
+    static_required_fields = ('title', 'annual_return')
+    listing_selector = "a[href*='/property'], a[href*='/proyecto'], a[href*='/project']"
+    
     def __init__(self):
         super().__init__(
             platform_name="reental",
-            base_url="https://www.reental.co"
+            base_url="https://www.reental.co",
+            allowed_hosts=["reental.co"]
         )
     
     def scrape_marketplace(self) -> List[str]:
         """Scrape all property URLs from the marketplace"""
-        self.driver.get(self.base_url)
-        time.sleep(3)
+        self.load_page(self.base_url, self.listing_selector)
         
         property_urls = []
         
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            for _ in range(5):  # Scroll a few times to load more content
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            self.scroll_listings()
             
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/property'], a[href*='/proyecto'], a[href*='/project']")
+            property_elements = self.driver.find_elements(By.CSS_SELECTOR, self.listing_selector)
             
             for element in property_elements:
                 url = element.get_attribute('href')
                 if url and url not in property_urls and self.base_url in url:
                     property_urls.append(url)
+                    self.listing_summaries[url] = element.text
             
         except Exception as e:
             print(f"Error scraping marketplace: {str(e)}")
@@ -53,8 +51,7 @@ class ReentalScraper(BaseScraper):
     
     def scrape_property_details(self, property_url: str) -> Dict:
         """Scrape detailed information for a single property"""
-        self.driver.get(property_url)
-        time.sleep(3)
+        self.load_page(property_url)
         
         property_data = {
             'platform': 'Reental.co',
@@ -67,6 +64,8 @@ class ReentalScraper(BaseScraper):
             try:
                 title = self.driver.find_element(By.CSS_SELECTOR, "h1").text
                 property_data['title'] = title
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -74,6 +73,8 @@ class ReentalScraper(BaseScraper):
                 location = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Ubicación') or contains(text(), 'Location')]")
                 parent = location.find_element(By.XPATH, "./..")
                 property_data['location'] = parent.text
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -84,6 +85,8 @@ class ReentalScraper(BaseScraper):
                     if '$' in text or '€' in text:
                         property_data['investment_amount'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -94,6 +97,8 @@ class ReentalScraper(BaseScraper):
                     if '%' in text:
                         property_data['annual_return'] = text
                         break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -103,12 +108,16 @@ class ReentalScraper(BaseScraper):
                     parent = element.find_element(By.XPATH, "./..")
                     property_data['rental_start_date'] = parent.text
                     break
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
             try:
                 all_text = self.driver.find_element(By.TAG_NAME, "body").text
                 property_data['full_description'] = all_text[:1000]  # First 1000 chars
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -120,6 +129,8 @@ class ReentalScraper(BaseScraper):
                     if src and 'http' in src and 'reental' in src:
                         image_urls.append(src)
                 property_data['images'] = image_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
@@ -133,15 +144,18 @@ class ReentalScraper(BaseScraper):
                         document_urls.append(href)
                         
                         try:
-                            filename = f"{property_data['property_id']}_{len(document_urls)}.pdf"
-                            self.download_file(href, filename)
+                            self.download_file(href, property_data['property_id'])
                         except:
                             pass
                 
                 property_data['documents'] = document_urls
+            except StaleElementReferenceException:
+                raise
             except:
                 pass
             
+        except StaleElementReferenceException:
+            raise
         except Exception as e:
             print(f"Error scraping property details: {str(e)}")
         
@@ -150,4 +164,4 @@ class ReentalScraper(BaseScraper):
 
 if __name__ == "__main__":
     scraper = ReentalScraper()
-    scraper.run(full_scrape=True)
+    scraper.run(full_scrape=True, resume='--resume' in sys.argv)
@@ -0,0 +1,97 @@
+"""
+Streaming NDJSON snapshot writer
+Scrapers append each property as soon as its details are scraped, so a crash
+mid-run keeps everything scraped so far in the .part file for --resume.
+finalize() publishes the snapshot with an atomic rename; the save and diff
+passes stream it back from disk, so memory stays flat however large the run.
+Once they are done, discard() removes the NDJSON so each run is stored only
+in the configured formats
+"""
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+
+class SnapshotWriter:
+    """One run's properties, one JSON record per line"""
+    
+    def __init__(self, output_dir: str, timestamp: Optional[str] = None):
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.path = os.path.join(output_dir, f"properties_{timestamp}.ndjson")
+        self.temp_path = f"{self.path}.part"
+        self.count = 0
+        self.finalized = False
+        
+        self._lock = threading.Lock()
+        self._file = open(self.temp_path, 'w', encoding='utf-8')
+    
+    @classmethod
+    def resume(cls, path: str) -> 'SnapshotWriter':
+        """Reopen an unfinished snapshot, dropping a torn final line"""
+        temp_path = f"{path}.part"
+        with open(temp_path, 'rb') as f:
+            data = f.read()
+        complete = data[:data.rfind(b'\n') + 1]
+        
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer.temp_path = temp_path
+        writer.count = complete.count(b'\n')
+        writer.finalized = False
+        writer._lock = threading.Lock()
+        
+        with open(temp_path, 'wb') as f:
+            f.write(complete)
+        writer._file = open(temp_path, 'a', encoding='utf-8')
+        return writer
+    
+    def write(self, record: Dict):
+        """Append a record; safe to call from the detail worker threads"""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+    
+    def finalize(self) -> str:
+        """Flush to disk and atomically move the snapshot into place"""
+        with self._lock:
+            if not self.finalized:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                os.replace(self.temp_path, self.path)
+                self.finalized = True
+        
+        return self.path
+    
+    def discard(self):
+        """Remove the published NDJSON once the run's saves and diffs have read it"""
+        with self._lock:
+            if self.finalized and os.path.exists(self.path):
+                os.remove(self.path)
+    
+    def close(self):
+        """Close without publishing; an unfinished run leaves its .part file behind"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+    
+    def __iter__(self) -> Iterator[Dict]:
+        """Stream the records written so far back from disk"""
+        with self._lock:
+            if self.finalized:
+                return self._read(self.path)
+            if not self._file.closed:
+                self._file.flush()
+        
+        return self._read(self.temp_path)
+    
+    @staticmethod
+    def _read(path: str) -> Iterator[Dict]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
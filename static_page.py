@@ -0,0 +1,92 @@
+"""
+HTTP + lxml stand-in for the parts of the Selenium WebDriver API the scrapers use
+Lets scrape_property_details run unchanged against server-rendered HTML
+"""
+import re
+import lxml.html
+from typing import List
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th',
+    'tr', 'ul'
+}
+
+
+def _normalize_text(text: str) -> str:
+    """Collapse whitespace the way a rendered element's .text looks"""
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class StaticElement:
+    """Wraps an lxml element with the WebElement methods the scrapers call"""
+    
+    def __init__(self, element):
+        self._element = element
+    
+    @property
+    def text(self) -> str:
+        return _normalize_text(self._element.text_content())
+    
+    def get_attribute(self, name: str):
+        return self._element.get(name)
+    
+    def find_element(self, by: str, value: str) -> 'StaticElement':
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matching {by}={value}")
+        return elements[0]
+    
+    def find_elements(self, by: str, value: str) -> List['StaticElement']:
+        if by == By.XPATH:
+            matches = self._element.xpath(value)
+        elif by == By.CSS_SELECTOR:
+            matches = self._element.cssselect(value)
+        elif by == By.TAG_NAME:
+            matches = self._element.xpath(f".//{value}")
+        else:
+            raise ValueError(f"Unsupported locator strategy for static pages: {by}")
+        
+        return [StaticElement(m) for m in matches if isinstance(m, lxml.html.HtmlElement)]
+
+
+class StaticDriver(StaticElement):
+    """Fetches pages with a pooled requests.Session instead of a browser"""
+    
+    def __init__(self, session, timeout: int = 30):
+        super().__init__(None)
+        self.session = session
+        self.timeout = timeout
+        self.current_url = None
+        self.page_source = ''
+    
+    def get(self, url: str):
+        """Fetch and parse a page (no JavaScript is executed)"""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        
+        document = lxml.html.fromstring(response.content, base_url=response.url)
+        
+        for node in document.xpath('//script | //style | //noscript | //template'):
+            node.drop_tree()
+        
+        # Break lines after block elements so .text matches rendered output
+        for node in document.iter(*BLOCK_TAGS):
+            node.tail = '\n' + (node.tail or '')
+        
+        document.make_links_absolute(response.url)
+        
+        self.current_url = response.url
+        self.page_source = response.text
+        self._element = document
+    
+    def execute_script(self, script: str, *args):
+        raise NotImplementedError("Static pages cannot execute JavaScript")
+    
+    def quit(self):
+        pass
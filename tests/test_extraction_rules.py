@@ -0,0 +1,163 @@
+"""
+Check the Lofty rule tables against the per-regex code they replaced
+"""
+import os
+import re
+import sys
+import random
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrapers.lofty_scraper import LoftyScraper
+from scrapers.lofty_scraper_enhanced import LoftyScraperEnhanced
+
+
+def enhanced_fields_before(page_text):
+    """LoftyScraperEnhanced's field regexes as they were before TEXT_RULES"""
+    property_data = {}
+    
+    price_match = re.search(r'Estimated Price[^\$]*\$([0-9,]+\.?\d*)', page_text, re.IGNORECASE)
+    if price_match:
+        property_data['estimated_price'] = f"${price_match.group(1)}"
+    return_match = re.search(r'Projected Annual Return[^\d]*([\d.]+)%', page_text, re.IGNORECASE)
+    if return_match:
+        property_data['projected_annual_return'] = f"{return_match.group(1)}%"
+    yield_match = re.search(r'Rental Yield[^\d]*([\d.]+)%', page_text, re.IGNORECASE)
+    if yield_match:
+        property_data['rental_yield'] = f"{yield_match.group(1)}%"
+    beds_match = re.search(r'(\d+)\s*Bed', page_text)
+    if beds_match:
+        property_data['bedrooms'] = beds_match.group(1)
+    baths_match = re.search(r'(\d+)\s*Bath', page_text)
+    if baths_match:
+        property_data['bathrooms'] = baths_match.group(1)
+    sqft_match = re.search(r'(\d+)\s*sqft', page_text)
+    if sqft_match:
+        property_data['square_feet'] = sqft_match.group(1)
+    type_match = re.search(r'(Single family|Multi-family|Condo|Townhouse)', page_text, re.IGNORECASE)
+    if type_match:
+        property_data['property_type'] = type_match.group(1)
+    built_match = re.search(r'Built in (\d{4})', page_text)
+    if built_match:
+        property_data['year_built'] = built_match.group(1)
+    rent_match = re.search(r'\$([0-9,]+)/month', page_text)
+    if rent_match:
+        property_data['monthly_rent'] = f"${rent_match.group(1)}"
+    lease_match = re.search(r'(\d+)\s*(?:year|month)\s*lease', page_text, re.IGNORECASE)
+    if lease_match:
+        property_data['lease_term'] = lease_match.group(0)
+    deposit_match = re.search(r'\$([0-9,]+)\s*Security Deposit', page_text)
+    if deposit_match:
+        property_data['security_deposit'] = f"${deposit_match.group(1)}"
+    loan_match = re.search(r'loan of \$([0-9,]+\.?\d*)', page_text, re.IGNORECASE)
+    if loan_match:
+        property_data['loan_amount'] = f"${loan_match.group(1)}"
+    rate_match = re.search(r'(\d+\.\d+)%\s*mortgage', page_text, re.IGNORECASE)
+    if rate_match:
+        property_data['mortgage_rate'] = f"{rate_match.group(1)}%"
+    rating_match = re.search(r'"([A-F])".*Rating.*Zip Code', page_text)
+    if rating_match:
+        property_data['niche_rating'] = rating_match.group(1)
+    
+    return property_data
+
+
+def lofty_fields_before(page_text):
+    """LoftyScraper's field regexes as they were before TEXT_RULES"""
+    property_data = {}
+    
+    token_match = re.search(r'\$(\d+(?:\.\d{2})?)\s*(?:per token|/token)', page_text, re.IGNORECASE)
+    if token_match:
+        property_data['token_price'] = f"${token_match.group(1)}"
+    tokens_match = re.search(r'(\d+(?:,\d{3})*)\s*tokens?', page_text, re.IGNORECASE)
+    if tokens_match:
+        property_data['total_tokens'] = tokens_match.group(1)
+    yield_match = re.search(r'(\d+(?:\.\d+)?%)\s*(?:yield|return|APY)', page_text, re.IGNORECASE)
+    if yield_match:
+        property_data['rental_yield'] = yield_match.group(1)
+    
+    return property_data
+
+
+def classify_document_before(text, href):
+    """LoftyScraperEnhanced.classify_document as the if/elif chain it was"""
+    doc_type = 'unknown'
+    
+    if 'appraisal' in text.lower() or 'appraisal' in href.lower():
+        doc_type = 'appraisal'
+    elif 'inspection' in text.lower():
+        doc_type = 'inspection'
+    elif 'lease' in text.lower():
+        doc_type = 'lease'
+    elif 'insurance' in text.lower():
+        doc_type = 'insurance'
+    elif 'loan' in text.lower() or 'mortgage' in text.lower():
+        doc_type = 'loan_documents'
+    elif 'management' in text.lower():
+        doc_type = 'property_management'
+    elif 'operating agreement' in text.lower():
+        doc_type = 'operating_agreement'
+    elif 'llc' in text.lower():
+        doc_type = 'llc_documents'
+    elif 'title' in text.lower() or 'deed' in text.lower():
+        doc_type = 'title_documents'
+    elif 'transaction' in text.lower():
+        doc_type = 'transaction_data'
+    elif 'asset.lofty.ai' in href:
+        doc_type = 'offering_document'
+    
+    return doc_type
+
+
+# Lines in the shape of Lofty page text, including near-misses for the rules
+PAGE_LINES = [
+    'Estimated Price', 'Estimated price\n$96,500', 'Estimated Price $412,000.50', 'ESTIMATED PRICE: TBD',
+    'Projected Annual Return\n11.2%', 'projected annual return 4.75 %', 'Projected Annual Return -',
+    'Rental Yield 8.45%', 'rental yield\n0.5%', '3 Beds', '3Bed 2 Bath', '1 Bath', '1232 sqft', '1,232 sqft',
+    'Single family', 'multi-family home', 'Condo', 'TOWNHOUSE', 'Built in 1951', 'Built in 19', '$1,150/month',
+    '12 month lease', '1 Year Lease', '$1,150 Security Deposit', 'a loan of $48,000.00', 'Loan of $',
+    '6.25% mortgage', '6% mortgage', '"B" Neighborhood Rating for Zip Code 48221', '"b" Rating Zip Code',
+    '$50.00 per token', '$50/token', '1,930 tokens', '1 token', '8.4% yield', '11% APY', '4.2% return',
+    'Invest now', '$', '%', '2024', 'Detroit, MI 48221', '\n', '   ',
+]
+
+DOCUMENT_WORDS = [
+    'Appraisal', 'Inspection Report', 'Lease', 'Insurance', 'Loan', 'Mortgage', 'Management Agreement',
+    'Operating Agreement', 'LLC', 'Title', 'Deed', 'Transaction', 'Offering', 'Memo', 'PDF', '',
+]
+
+DOCUMENT_HREFS = [
+    'https://asset.lofty.ai/prop_8f2c41/{}.pdf', 'https://www.dropbox.com/s/abc123/{}.pdf',
+    'https://docs.google.com/{}', 'https://www.lofty.ai/property_deal/{}',
+]
+
+
+class TextRulesMatchPerRegexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.random = random.Random(20)
+    
+    def page_text(self):
+        return ' '.join(self.random.choice(PAGE_LINES) for _ in range(self.random.randint(0, 25)))
+    
+    def test_enhanced_rules_match_old_regexes(self):
+        for _ in range(5000):
+            text = self.page_text()
+            self.assertEqual(LoftyScraperEnhanced.TEXT_RULES.extract(text), enhanced_fields_before(text), text)
+    
+    def test_lofty_rules_match_old_regexes(self):
+        for _ in range(5000):
+            text = self.page_text()
+            self.assertEqual(LoftyScraper.TEXT_RULES.extract(text), lofty_fields_before(text), text)
+    
+    def test_document_types_match_old_chain(self):
+        for _ in range(20000):
+            text = ' '.join(self.random.sample(DOCUMENT_WORDS, self.random.randint(0, 3)))
+            href = self.random.choice(DOCUMENT_HREFS).format(self.random.choice(DOCUMENT_WORDS).replace(' ', '_'))
+            self.assertEqual(LoftyScraperEnhanced.DOCUMENT_TYPES.classify(text, href), classify_document_before(text, href), (text, href))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Replay the Lofty API fixtures through LoftyApiScraper (see fixtures/lofty_api/README.md)
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+FIXTURES_DIR = os.path.join(ROOT, 'tests', 'fixtures', 'lofty_api')
+
+from scrapers.lofty_api_scraper import LoftyApiScraper
+from scrapers.lofty_scraper_enhanced import LoftyScraperEnhanced
+
+
+class LoftyApiScraperFixtureTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.environ['LOFTY_API_FIXTURES'] = FIXTURES_DIR
+        
+        self.scraper = LoftyApiScraper()
+        self.downloads = []
+        self.scraper.download_file = lambda url, property_id, doc_type='document': self.downloads.append((url, property_id, doc_type))
+    
+    def tearDown(self):
+        os.environ.pop('LOFTY_API_FIXTURES', None)
+        self.scraper.downloader.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def test_marketplace_urls_match_browser_scraper(self):
+        urls = self.scraper.scrape_marketplace()
+        
+        self.assertEqual(urls, [
+            'https://www.lofty.ai/property_deal/17500-Greenlawn-St_Detroit-MI-48221',
+            'https://www.lofty.ai/property_deal/2211-W-Berwyn-Ave_Chicago-IL-60625',
+        ])
+        # Same IDs the DOM scraper would derive from these links
+        self.assertEqual(
+            [LoftyScraperEnhanced.property_id_from_url(url) for url in urls],
+            ['17500-Greenlawn-St_Detroit-MI-48221', '2211-W-Berwyn-Ave_Chicago-IL-60625']
+        )
+    
+    def test_property_details(self):
+        url = self.scraper.scrape_marketplace()[0]
+        details = self.scraper.scrape_property_details(url)
+        
+        self.assertEqual(details['property_id'], '17500-Greenlawn-St_Detroit-MI-48221')
+        self.assertEqual(details['title'], '17500 Greenlawn St')
+        self.assertEqual(details['city_state'], 'Detroit, MI, 48221')
+        self.assertEqual(details['estimated_price'], '$96,500')
+        self.assertEqual(details['rental_yield'], '8.45%')
+        self.assertEqual(details['projected_annual_return'], '11.2%')
+        self.assertEqual(details['monthly_rent'], '$1,150')
+        self.assertEqual(details['year_built'], '1951')
+        self.assertEqual(details['full_description'], 'Single family home leased to a long-term tenant.')
+        self.assertEqual(len(details['images']), 2)
+        self.assertEqual(sorted(details['documents']), ['appraisal', 'lease'])
+        self.assertEqual(details['document_count'], 2)
+        self.assertEqual(len(self.downloads), 2)
+    
+    def test_percent_keys_are_not_rescaled(self):
+        url = self.scraper.scrape_marketplace()[1]
+        details = self.scraper.scrape_property_details(url)
+        
+        # rental_yield is already a percentage: 0.5 means 0.5%, not 50%
+        self.assertEqual(details['rental_yield'], '0.5%')
+        self.assertEqual(details['projected_annual_return'], '4.75%')
+        self.assertEqual(details['estimated_price'], '$412,000.50')
+        self.assertEqual(details['city_state'], 'Chicago, IL 60625')
+        self.assertEqual(details['images'], ['https://images.lofty.ai/prop_1d90aa/front.jpg'])
+        # No description: nothing is made up from the raw record
+        self.assertNotIn('full_description', details)
+    
+    def test_ratio_keys_are_scaled(self):
+        self.scraper.RATIO_KEYS = frozenset({'rentalYield'})
+        
+        self.assertEqual(self.scraper._format_value('rental_yield', 'rentalYield', 0.0845), '8.45%')
+        self.assertEqual(self.scraper._format_value('rental_yield', 'rental_yield', 0.5), '0.5%')
+    
+    def test_resume_rebuilds_listings(self):
+        self.scraper.scrape_marketplace()
+        summaries = dict(self.scraper.listing_summaries)
+        
+        resumed = LoftyApiScraper()
+        resumed.listing_summaries = summaries
+        resumed.resume_marketplace()
+        try:
+            self.assertEqual(set(resumed._listings), set(self.scraper._listings))
+        finally:
+            resumed.downloader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()